@@ -0,0 +1,109 @@
+# =============================================================================
+# ALERT LOG MODULE
+# =============================================================================
+# INF601 - Advanced Programming in Python
+# Jeremy McKowski
+# Final Project
+#
+# This file stores the security alerts for my "Suspicious Traffic Alerts" table
+# I used to keep a list of dictionaries (one dict per alert), so every filter
+# or count had to look inside each dict one at a time in Python
+# Now I keep one NumPy array per field instead ("columns" instead of "rows"),
+# so filtering by device is a single array comparison
+# The arrays are a fixed-size ring buffer (like my traffic history), so adding
+# an alert just overwrites the oldest slot instead of building new arrays
+
+# =============================================================================
+# IMPORT REQUIRED LIBRARIES
+# =============================================================================
+import numpy as np
+# Each alert field gets its own NumPy array
+
+# =============================================================================
+# DEFAULT SETTINGS
+# =============================================================================
+# I only keep the 50 newest alerts so the table doesn't grow forever
+ALERT_CAPACITY = 50
+
+# Severity is only ever "Low", "Medium" or "High", so I store it as a tiny
+# number code instead of text: its position in this tuple (Low = 0, High = 2)
+# That's the same order as my table's severity category, so the dashboard can
+# turn the codes straight into the Severity column without reading any text
+SEVERITY_LEVELS = ('Low', 'Medium', 'High')
+SEVERITY_CODES = {level: code for code, level in enumerate(SEVERITY_LEVELS)}
+
+# The alert fields and the NumPy type I store each one as
+# 'time' is the timestamp already formatted for the table ("2025-11-30 17:45:23")
+# I don't keep the generator's raw datetime 'timestamp' at all - nothing reads
+# it, and turning every one into a datetime64 was the only date work left
+ALERT_FIELDS = {
+    'time': object,
+    'device': object,
+    'external_ip': object,
+    'reason': object,
+    'severity': np.int8
+}
+
+# Every field except severity is stored just as the generator made it
+PLAIN_FIELDS = tuple(name for name in ALERT_FIELDS if name != 'severity')
+
+
+# =============================================================================
+# AlertLog CLASS DEFINITION
+# =============================================================================
+class AlertLog:
+    """
+    The newest security alerts, stored as one fixed-size array per field
+
+    - head is where the next alert goes, count is how many alerts I have
+    - version goes up by one every time new alerts come in, so the dashboard
+      can tell if anything changed without looking at the alerts themselves
+    - columns() hands them back newest first
+    - severity is stored as its code in SEVERITY_LEVELS (0 = Low, 2 = High)
+    """
+
+    def __init__(self, capacity=ALERT_CAPACITY):
+        """Allocates the empty arrays once - they never grow after this"""
+        self.capacity = capacity
+        self.fields = {name: np.empty(capacity, dtype=dtype) for name, dtype in ALERT_FIELDS.items()}
+        self.head = 0
+        self.count = 0
+        self.version = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, alerts):
+        """
+        Writes new alerts (a list of dicts from my generator) over the oldest slots
+        The first alert in the list ends up as the newest one, same as before
+        """
+        # Like a deque with maxlen, anything past the newest capacity alerts
+        # would just get overwritten again, so I never write it at all
+        for alert in reversed(alerts[:self.capacity]):
+            for name in PLAIN_FIELDS:
+                self.fields[name][self.head] = alert[name]
+            self.fields['severity'][self.head] = SEVERITY_CODES[alert['severity']]
+            # The generator's alert says "High" etc, I store the code
+
+            # % wraps the head back to 0 when it hits the end of the arrays
+            self.head = (self.head + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+        if alerts:
+            self.version += 1
+
+    def columns(self, device=None):
+        """
+        Returns {field: array} newest first, for every alert or just one device's
+        The device filter is one comparison over the device array
+        """
+        # The newest alert is just before the head, then I walk backwards
+        order = (self.head - 1 - np.arange(self.count)) % self.capacity
+
+        if device is not None:
+            order = order[self.fields['device'][order] == device]
+
+        return {name: values[order] for name, values in self.fields.items()}
+
+###///###
@@ -26,36 +26,78 @@ import pandas as pd
 # It's like working with Excel spreadsheets but in Python
 # Makes it easier for me to filter and display the network information
 
-import time
-# I need the time module for my auto-refresh feature
-# I use time.sleep() to pause between dashboard updates
-# This way the dashboard doesn't refresh too fast and overwhelm the user
-
-import plotly.express as px
-# I'm using Plotly Express for my world map visualization
-# My professor showed us this library for making interactive charts
-# I picked it over matplotlib because users can zoom and hover on the charts
-
 import plotly.graph_objects as go
-# I'm using Plotly Graph Objects for my network speed graph
+# I'm using Plotly Graph Objects for my network speed graph and world map
+# My professor showed us Plotly for making interactive charts
+# I picked it over matplotlib because users can zoom and hover on the charts
 # This gives me more control over the colors and styling than plotly.express
 # I needed this for the filled area under the speed lines
 
-from datetime import datetime, timedelta
-# I'm importing datetime tools to work with timestamps
-# I use datetime to record when each data point happens
-# I use timedelta to calculate the 30-minute window for my graphs
+import plotly.io as pio
+pio.json.config.default_engine = 'orjson'
+# Streamlit turns every Plotly figure into JSON on every refresh
+# orjson is a much faster JSON library than Python's built-in json module
+# Plotly only uses it if I tell it to (or if it happens to be installed),
+# so I set it here and list orjson in requirements.txt
+
+import time
+# I use time.monotonic_ns() to timestamp each data point for my graph
+# and time.monotonic() to space out how often I check for new alerts
 
-from data_generator import NetworkTrafficGenerator
+import re
+# I use a regular expression to strip the comments out of my CSS
+
+import threading
+# A lock keeps two sessions from changing my shared map figure at the same time
+
+from data_generator import NetworkTrafficGenerator, BYTES_PER_MB
 # This is my custom module that creates fake network data
 # I made this because I can't access real Ubiquiti router APIs
 # It generates realistic device names, IPs, and traffic to make my demo work
+# BYTES_PER_MB is its bytes-to-megabytes factor, so my totals use the same one
 
 from cve_fetcher import CVEFetcher
 # This is my custom module for fetching security vulnerabilities
 # I made this to pull CVE data from the National Vulnerability Database
 # It shows the latest security issues for Ubiquiti routers
 
+import numpy as np
+# I'm using NumPy to work with my graph history as arrays
+# It's much faster than looping over Python lists point by point
+
+import pyarrow as pa
+import pyarrow.compute as pc
+# PyArrow is the table format Streamlit sends to the browser
+# I build my devices table in Arrow directly so pandas doesn't have to convert it
+
+from chart_helpers import lttb_indices, bin_connections
+# This is my helper that thins out the graph points before plotting
+# Plotly gets slow with thousands of points, so I only send what the screen can show
+# bin_connections() groups my map dots into grid cells so overlapping dots become one
+
+from traffic_history import TrafficHistory, HISTORY_WINDOW_NS, MONOTONIC_TO_LOCAL_NS
+# This is my ring buffer class for the 30-minute speed history
+# It keeps the history in fixed-size NumPy arrays instead of growing lists
+
+from alert_log import AlertLog, SEVERITY_CODES
+# This stores my security alerts as one NumPy array per field
+# instead of a list of dictionaries
+
+from dashboard_config import (
+    DOWNLOAD_LINE, DOWNLOAD_FILL, UPLOAD_LINE, UPLOAD_FILL,
+    SPEED_MARGIN, SPEED_LEGEND,
+    MAP_MARKER, MAP_GEO_STYLE,
+    DEVICE_TABLE_HEADERS, DEVICE_INFO_SCHEMA, DEVICE_STATUS_VALUES,
+    ALERT_SEVERITY_VALUES, ALERT_SOURCE_COLUMNS,
+    ALERT_TABLE_HEADERS, ALERT_COLUMN_CONFIG
+)
+# These are my fixed settings (chart styles, which table columns to show, labels)
+# They live in their own module so they're only built once, not every refresh
+
+from connection_feed import ConnectionFeed, CONNECTION_REFRESH_SECONDS
+# This makes my map's external connections on a background thread
+# so drawing the page never has to wait for them
+
 # ============================================================================
 # STEP 1: PAGE CONFIGURATION
 # ============================================================================
@@ -81,7 +123,7 @@ st.set_page_config(
 # My professor showed me how to inject CSS using st.markdown()
 # I have to set unsafe_allow_html=True so Streamlit actually runs my CSS
 
-st.markdown(""" 
+DASHBOARD_CSS = """
     <style>
         /* ================================================================
            HIDING STREAMLIT UI ELEMENTS
@@ -198,8 +240,107 @@ st.markdown("""
             opacity: 1 !important;
             /* This stops the whole page from fading when it refreshes */
         }
+
+        /* ================================================================
+           DASHBOARD CARDS
+           ================================================================
+           My ISP card, metric cards, live speed cards and device detail
+           cards all share the same dark box look. I used to repeat that
+           look as a style='' on every card, and the live panel sends its
+           cards again every tick. Now the look lives here once and each
+           card just says which classes it uses.
+           I start every class with "dash-" so they can't clash with Streamlit's
+        */
+
+        /* The dark box every card uses */
+        .dash-card {
+            background: #1a1a1a;
+            border: 1px solid #333;
+            border-radius: 8px;
+            padding: 15px;
+        }
+
+        /* A row of cards side by side (the number of columns is set per grid) */
+        .dash-grid {
+            display: grid;
+            gap: 16px;
+            margin-bottom: 16px;
+        }
+
+        /* The small gray title and the big number inside a card */
+        .dash-label {
+            color: #888;
+            font-size: 14px;
+            margin-bottom: 5px;
+        }
+        .dash-value {
+            color: white;
+            font-size: 32px;
+            font-weight: 500;
+        }
+
+        /* Live speed cards (STEP 7.25) - bigger, centered, colored number */
+        .dash-speed {
+            padding: 20px;
+            text-align: center;
+        }
+        .dash-speed .dash-label {
+            margin-bottom: 10px;
+        }
+        .dash-speed .dash-value {
+            font-size: 36px;
+            font-weight: bold;
+        }
+        .dash-download {
+            border-color: #00d4ff;
+            color: #00d4ff;
+            /* Cyan for download, like my graph */
+        }
+        .dash-upload {
+            border-color: #a855f7;
+            color: #a855f7;
+            /* Purple for upload */
+        }
+        .dash-download .dash-value,
+        .dash-upload .dash-value {
+            color: inherit;
+            /* The number takes the card's color */
+        }
+
+        /* Device detail cards (STEP 6.5) - centered, smaller text */
+        .dash-detail {
+            text-align: center;
+        }
+        .dash-detail .dash-label {
+            font-size: 12px;
+        }
+        .dash-detail .dash-value {
+            font-size: 16px;
+            font-weight: bold;
+        }
     </style>
-""", unsafe_allow_html=True)
+"""
+# This is all my CSS plus the comments that explain it
+# The comments are for me, the browser doesn't need them
+
+
+@st.cache_resource
+def _compact_css():
+    """
+    Strips the comments and blank lines out of DASHBOARD_CSS
+    @st.cache_resource means I only do this once for the whole app
+    """
+    css = re.sub(r'/\*.*?\*/', '', DASHBOARD_CSS, flags=re.DOTALL)
+    # /* ... */ is a CSS comment, re.DOTALL lets one comment span several lines
+    return '\n'.join(line.strip() for line in css.splitlines() if line.strip())
+    # I also drop the indentation and empty lines
+
+
+st.markdown(_compact_css(), unsafe_allow_html=True)
+# Streamlit clears anything my script doesn't draw again on a full run,
+# so I still have to send the CSS every time the whole script runs
+# It's a lot smaller without the comments though, and since the Live Updates
+# only rerun my fragments (not the whole script), it isn't sent every tick
 # I have to set unsafe_allow_html=True to make the CSS work
 # My professor warned us this is a security risk with user input #Github reviee profZ youtube
 # I used claude to ensure safe CSS
@@ -220,42 +361,56 @@ st.markdown("""
 
 ##claude assisted in helping make sure I did this right
 
-if 'traffic_generator' not in st.session_state:
-    # I check if traffic_generator already exists before creating it
-    # This way I only create it once (first time the app runs)
-    # If I didn't do this check, I'd recreate it every refresh
-
-    st.session_state.traffic_generator = NetworkTrafficGenerator()
+@st.cache_resource
+def get_traffic_generator():
+    """
+    Creates my traffic generator once for the whole app
+
+    @st.cache_resource means every browser session gets the same generator
+    back, so everyone watching sees the same simulated home network
+    (same MAC addresses, same traffic counters) instead of each tab making
+    up its own. Things that belong to one viewer, like their graph history
+    and alerts, still live in st.session_state below.
+    """
+    return NetworkTrafficGenerator()
     # This is my custom class that generates fake network data
     # I create it once and keep reusing it so:
     #   - Device names stay the same across refreshes
     #   - Traffic counters keep accumulating instead of resetting
     #   - My app doesn't slow down from creating new objects constantly
 
-if 'cve_fetcher' not in st.session_state:
-    # Same idea - I only create my CVE fetcher once
-    st.session_state.cve_fetcher = CVEFetcher()
+
+@st.cache_resource
+def get_cve_fetcher():
+    """
+    Creates my CVE fetcher once for the whole app
+
+    The fetcher keeps its last results for an hour (see cve_fetcher.py)
+    I used to make one per browser session, so every new tab started with an
+    empty cache and called the NVD API again. With @st.cache_resource every
+    session shares one fetcher, so they all share its cached CVEs too
+    """
+    return CVEFetcher()
     # This is my class that calls the NVD API for security vulnerabilities
-    # I keep it in session_state so I can cache API responses
-    # This helps me avoid hitting the rate limits
-
-if 'traffic_history' not in st.session_state:
-    # I'm initializing storage for my 30-minute traffic history
-    # This is for the "All Devices" view on my speed graph
-    st.session_state.traffic_history = {
-        'timestamps': [],           # I'll store datetime objects here
-        'download_speeds': [],      # I'll store download speeds here (MB/s)
-        'upload_speeds': []         # I'll store upload speeds here (MB/s)
-    }
-    # I start with empty lists and they fill up as the dashboard runs
-    # Eventually they'll have 30 minutes worth of data points
+    # Sharing it helps me avoid hitting the rate limits
 
 if 'security_alerts' not in st.session_state:
     # I'm initializing storage for security alerts
-    st.session_state.security_alerts = []
+    st.session_state.security_alerts = AlertLog()
     # Starts empty
-    # My data generator will add fake security alerts to this list
-    # I limit it to 50 alerts total so it doesn't grow forever
+    # My data generator will add fake security alerts to this log
+    # It keeps 50 alerts max so it doesn't grow forever (see alert_log.py)
+
+if 'device_traffic_history' not in st.session_state:
+    # I'm creating the storage for my 30-minute throughput graph
+    st.session_state.device_traffic_history = TrafficHistory(
+        devices=len(get_traffic_generator().get_device_names())
+    )
+    # One ring buffer for every device together (see traffic_history.py)
+    # Each sample is one timestamp plus a row of speeds, one per device,
+    # in the same order as my generator's device list
+    # I used to create it inside the live panel, which meant checking for it
+    # on every tick - now it's set up here with the rest of my session state
 
 # ============================================================================
 # STEP 4: SIDEBAR CONTROLS AND USER INPUTS
@@ -290,22 +445,51 @@ refresh_rate = st.sidebar.slider("Refresh Rate (seconds)", 1, 10, 1)
 # I start it at 1 second (fast updates)
 # Even if live updates are off, this slider still works
 
+LIVE_RUN_EVERY = refresh_rate if auto_refresh else None
+# This is the timer for my live parts of the page (the live panel and alerts)
+# When Live Updates are on, Streamlit reruns just those fragments every
+# refresh_rate seconds on its own - no time.sleep() holding up my script
+# and no st.rerun() of the whole page
+# None means no timer: they only update when the user changes something
+
 # ----------------------------------------------------------------------------
 # CONTROL 3: DEVICE SELECTION DROPDOWN
 # ----------------------------------------------------------------------------
 # I'm adding a dropdown so users can filter by device or view everything
 
-temp_devices = st.session_state.traffic_generator.get_devices()
-# I have to fetch the device list first so I can populate the dropdown
-# I call it temp_devices because I just need it temporarily
-# The main device data gets fetched later in the code
+@st.cache_resource
+def get_device_options():
+    """
+    Builds the dropdown options once for the whole app
 
-device_names = ["All Devices"] + [device['name'] for device in temp_devices]
-# I'm building a list of device names for the dropdown
-# I start with "All Devices" as the first option
-# Then I use a list comprehension to extract just the names from temp_devices
-# The + operator combines these into one list
-# So I get: ["All Devices", "Home PC", "iPhone", etc.]
+    I used to run a whole traffic tick here just to read the names
+    (and my live panel runs another one right after)
+    The names never change, so I ask for just the names and keep them
+    """
+    return ("All Devices",) + get_traffic_generator().get_device_names()
+    # I start with "All Devices" as the first option, then every device name
+    # So I get: ("All Devices", "Home PC", "iPhone", etc.)
+    # It's a tuple so nothing can change the cached options by accident
+
+
+@st.cache_resource
+def get_device_info_table():
+    """
+    Builds the columns of my devices table that never change, once for the whole app
+
+    Name, type, IP, MAC and connection type stay the same for as long as
+    the app runs, so only status, last seen and the MB columns get built
+    on each refresh (see STEP 8)
+    """
+    return pa.Table.from_pylist(get_traffic_generator().get_device_info(), schema=DEVICE_INFO_SCHEMA)
+    # DEVICE_INFO_SCHEMA (in dashboard_config.py) pins the type of every column
+    # Keys that aren't in the schema (like the speeds and byte counts) get left out
+    # Arrow tables can't be changed in place, so handing every session the
+    # same cached table is safe
+
+
+device_names = get_device_options()
+# I'm getting the list of device names for the dropdown
 
 selected_device = st.sidebar.selectbox("Select Device", device_names, index=0)
 # I'm using st.sidebar.selectbox() to create the dropdown
@@ -314,6 +498,37 @@ selected_device = st.sidebar.selectbox("Select Device", device_names, index=0)
 # This returns the name of whatever device the user picks
 # I use this throughout my code to filter the data
 
+# ----------------------------------------------------------------------------
+# CONTROL 4: DASHBOARD SECTION SWITCHER
+# ----------------------------------------------------------------------------
+# I'm letting users pick which section they want to look at
+# The graph and map are the slowest parts of my dashboard to build, so when
+# the user only wants the devices and alerts, I skip them completely
+
+SECTION_LABELS = {
+    'overview': "Overview (graph + map)",
+    'devices': "Devices & Alerts only"
+}
+# The keys are what I check in my code, the values are what users see
+
+st.sidebar.radio(
+    "Dashboard View",
+    list(SECTION_LABELS.keys()),
+    format_func=lambda section: SECTION_LABELS[section],
+    key='active_section'
+)
+# key='active_section' makes Streamlit save the choice in st.session_state
+# format_func shows the friendly label instead of the key
+
+show_charts = st.session_state.get('active_section') == 'overview'
+# I only build the throughput graph and the map when this is True
+
+detailed_graph = st.sidebar.toggle("Detailed Throughput Graph", value=False)
+# Off: my throughput graph is Streamlit's own area chart, which is sent to the
+# browser as a small Arrow table and is quick to redraw every tick
+# On: I switch to my full Plotly graph (unified tooltips, legend toggles,
+# drag to zoom), which sends a bigger figure to the browser every tick
+
 st.sidebar.markdown("---")
 # I'm adding a horizontal line to separate the controls from the About section
 # This makes the sidebar look more organized
@@ -349,29 +564,26 @@ header_left, header_right = st.columns([1, 1])
 # ----------------------------------------------------------------------------
 # LEFT HEADER: ISP INFORMATION DISPLAY
 # ----------------------------------------------------------------------------
+ISP_CARD_HTML = (
+    "<div class='dash-card' style='color: white; margin-bottom: 10px;'>"
+    "<div style='font-size: 16px; font-weight: 500; margin-bottom: 8px;'>ISP: ISP.net</div>"
+    "<div style='font-size: 14px; color: #888;'>IP Address: 1.2.3.4</div>"
+    "</div>"
+)
+# The ISP card never changes, so it's one fixed string
+# Python joins the pieces together once when it reads my script, and there's
+# no indentation for Streamlit to strip out or send to the browser
+# The header only gets drawn on a full run of my script anyway - the Live
+# Updates only rerun my fragments, so this isn't sent every tick
+
 with header_left:
     # I'm using 'with' so everything inside here goes in the left column
     # This is how Streamlit knows where to put each widget
 
-    st.markdown(
-        """
-        <div style='
-            background: #1a1a1a;
-            border: 1px solid #333;
-            border-radius: 8px;
-            padding: 15px;
-            color: white;
-            margin-bottom: 10px;
-        '>
-            <div style='font-size: 16px; font-weight: 500; margin-bottom: 8px;'>ISP: ISP.net</div>
-            <div style='font-size: 14px; color: #888;'>IP Address: 1.2.3.4</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(ISP_CARD_HTML, unsafe_allow_html=True)
     # I'm using HTML/CSS here to create a custom info card
     # Streamlit's built-in widgets didn't give me the exact look I wanted
-    # My CSS styling:
+    # My CSS styling (the dash-card class in my CSS from STEP 2):
     #   - background: #1a1a1a makes it dark gray (matches my dashboard theme)
     #   - border: 1px solid #333 adds a subtle gray border
     #   - border-radius: 8px rounds the corners
@@ -395,8 +607,8 @@ with header_right:
     # =========================================================================
     # FETCH THE LATEST 3 CVES
     # =========================================================================
-    # I call my CVE fetcher (stored in session state) to get 3 vulnerabilities
-    cve_data = st.session_state.cve_fetcher.get_ubiquiti_cves(max_results=3)
+    # I call my shared CVE fetcher (see get_cve_fetcher() in STEP 3) to get 3 vulnerabilities
+    cve_data = get_cve_fetcher().get_ubiquiti_cves(max_results=3)
     # This returns a list of dictionaries with CVE info, or None if it fails
 
     # =========================================================================
@@ -467,6 +679,11 @@ with header_right:
             # Every CVE has a details page on the NVD website
             # I just insert the CVE ID into the URL
 
+            # My fetcher uses None for a missing score or date, so I only turn
+            # those into "N/A" here when I show them
+            cvss_text = 'N/A' if cve['cvss_score'] is None else f"{cve['cvss_score']:.1f}"
+            published_text = cve['published'] or 'N/A'
+
             # Display this CVE as a clickable card
             # I use HTML to create a card with the CVE info that links to the NVD page
             st.markdown(
@@ -482,9 +699,9 @@ with header_right:
                     '>
                         <div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 4px;'>
                             <span style='font-size: 13px; font-weight: bold; color: white;'>{cve_id}</span>
-                            <span style='font-size: 11px; color: {color};'>{severity} ({cve['cvss_score']})</span>
+                            <span style='font-size: 11px; color: {color};'>{severity} ({cvss_text})</span>
                         </div>
-                        <div style='font-size: 11px; color: #999;'>{cve['published']}</div>
+                        <div style='font-size: 11px; color: #999;'>{published_text}</div>
                     </div>
                 </a>
                 """,
@@ -568,524 +785,115 @@ st.markdown("### Real-time Traffic Simulation")
 # My professor said it's important to clarify this is demo data, not real
 
 # ============================================================================
-# STEP 5: FETCH CURRENT DEVICE DATA
+# LIVE PANEL (STEPS 5-8)
 # ============================================================================
-# I'm calling my traffic generator to get the current device data
-# This updates all the simulated traffic, device statuses, and timestamps
-# It returns a list of dictionaries (one dictionary per device)
-devices = st.session_state.traffic_generator.get_devices()
-
-# ============================================================================
-# STEP 6: PROCESS AND TRANSFORM RAW DEVICE DATA
-# ============================================================================
-# I'm taking my device data and transforming it into a more usable format
-# My data generator gives me a list of dictionaries (one per device)
-# I'm converting it to a pandas DataFrame so I can do calculations easier
-
-df = pd.DataFrame(devices)
-# I'm using pd.DataFrame() to convert my list of dicts into a table
-# This makes it way easier to work with the data
-# I can now use pandas methods like .sum(), .filter(), etc.
-# Example: [{'name': 'PC', 'download_bytes': 5000000}, ...] becomes a table
+# Everything from STEP 5 to STEP 8 (device data, metrics, live speeds, graph,
+# devices table) is the only part of my page that changes every tick
+# I used to rerun my whole script every refresh_rate seconds for it, which
+# also redrew the sidebar, CSS, ISP/CVE header, map and alerts every time
+# Now it's one fragment with its own timer, so only this panel reruns
 
 # ----------------------------------------------------------------------------
-# SUBSECTION 6A: UNIT CONVERSION (BYTES TO MEGABYTES)
+# METRIC CARD TEMPLATE (STEP 7)
 # ----------------------------------------------------------------------------
-# I'm converting the traffic from bytes to megabytes
-# Bytes are too small to read easily (like 5,242,880 bytes)
-# Megabytes are much cleaner (5.00 MB)
-
-df['Download (MB)'] = df['download_bytes'] / (1024 * 1024)
-# I'm dividing by 1024 twice (not 1,000,000)
-# My professor taught us that computers use binary:
-#   - 1 KB = 1,024 bytes (not 1,000)
-#   - 1 MB = 1,024 KB = 1,048,576 bytes total
-# This creates a new column in my DataFrame with the MB values
-# The original bytes column stays there too
-
-df['Upload (MB)'] = df['upload_bytes'] / (1024 * 1024)
-# Same conversion for upload traffic
-# Now I have both bytes and MB columns to work with
+METRIC_CARD_TEMPLATE = """
+    <div class='dash-card'>
+        <div class='dash-label'>{label}</div>
+        <div class='dash-value'>{value}</div>
+    </div>
+""".strip()
+# This is the shared layout for one metric card
+# {label} and {value} get filled in by metric_card() below
+# How it looks comes from the dash-card classes in my CSS (STEP 2)
+# .strip() takes off the blank lines at the start and end, because a blank
+# line between two cards would end the HTML and show the next card as text
 
-# ----------------------------------------------------------------------------
-# SUBSECTION 6B: DATA FILTERING BASED ON USER SELECTION
-# ----------------------------------------------------------------------------
-# I'm filtering my data based on what the user picked in the dropdown
-# If they picked a specific device, I only show that device's data
-# If they picked "All Devices", I show everything
-
-if selected_device != "All Devices":
-    # User picked a specific device
-    # I need to filter my DataFrame to just that one device
-
-    df_filtered = df[df['name'] == selected_device].copy()
-    # I'm creating a boolean mask where True = name matches
-    # Then I use that mask to filter the DataFrame
-    # .copy() makes a new DataFrame so I don't accidentally modify the original
-
-    # I'm extracting that device's full info for the details panel
-    if len(df_filtered) > 0:
-        # I'm checking that the device actually exists in my data
-
-        selected_device_data = df_filtered.iloc[0].to_dict()
-        # iloc[0] gets the first row (should be only 1 row since I filtered by name)
-        # .to_dict() converts it to a dictionary so I can access fields easily
-        # This gives me all the device info: IP, MAC, status, etc.
-    else:
-        # Device doesn't exist (this shouldn't happen but I'm being safe)
-        selected_device_data = None
-else:
-    # User picked "All Devices" - I show everything
-    df_filtered = df.copy()
-    # I'm copying the whole DataFrame
-    # I do .copy() so I keep my code consistent (always use df_filtered)
 
-    selected_device_data = None
-    # No single device to show details for
+def metric_card(label, value):
+    # I'm filling in the card template with a label and its value
+    return METRIC_CARD_TEMPLATE.format(label=label, value=value)
 
-# ----------------------------------------------------------------------------
-# SUBSECTION 6C: CALCULATE AGGREGATE STATISTICS
-# ----------------------------------------------------------------------------
-# I'm calculating summary stats that I'll display at the top of my dashboard
-# These calculations use my filtered data, so they change based on user selection
-
-total_devices = len(df_filtered[df_filtered['status'] == 'ONLINE'])
-# I'm counting how many online devices there are
-# I create a boolean mask for devices with status=='ONLINE'
-# Then I count how many rows match
-# If viewing all devices: this is total online devices
-# If viewing one device: this is 1 (if online) or 0 (if offline)
-
-total_download = df_filtered['Download (MB)'].sum()
-# I'm adding up all the download traffic
-# .sum() adds all values in that column
-# For "All Devices": this is total network traffic
-# For single device: this is that device's traffic
-
-total_upload = df_filtered['Upload (MB)'].sum()
-# Same idea but for upload traffic
 
 # ----------------------------------------------------------------------------
-# SUBSECTION 6D: EXTRACT CURRENT SPEEDS FOR LIVE DISPLAY
+# LIVE THROUGHPUT CARDS TEMPLATE (STEP 7.25)
 # ----------------------------------------------------------------------------
-# I'm getting the current speeds (not cumulative totals)
-# These are the live MB/s values I show in the big speed cards
-
-current_download_speed = df_filtered['current_download_speed'].sum()
-# This is the current download speed from my data generator
-# It represents what's happening right now (not total over time)
-# I use .sum() to add up all devices (for "All Devices" view)
-# For single device view, it's just that device's speed
-
-current_upload_speed = df_filtered['current_upload_speed'].sum()
-# Same thing but for upload speed
-
-# ----------------------------------------------------------------------------
-# SUBSECTION 6E: TRAFFIC HISTORY TRACKING (PER-DEVICE)
-# ----------------------------------------------------------------------------
-# I'm tracking historical speed data for each device over time
-# This is what I use for my 30-minute throughput graph
-# I store it in session_state so it doesn't reset on every refresh
-
-if 'device_traffic_history' not in st.session_state:
-    # First time running - I need to create the storage structure
-    st.session_state.device_traffic_history = {}
-    # This will be a dictionary of dictionaries:
-    # Each device name is a key, value is another dict with timestamps and speeds
-
-# I'm getting the current time to timestamp this data point
-current_time = datetime.now()
-# This gives me the exact current date and time
-# I need this so I can plot my data on a time axis
-
-# I'm looping through each device to record its current speed
-for _, device in df.iterrows():
-    # df.iterrows() lets me loop through the DataFrame row by row
-    # I don't need the index so I use _ to ignore it
-    # device is like a dictionary with all the columns for that row
-
-    device_name = device['name']
-    # I'm getting this device's name to use as a key
-
-    if device_name not in st.session_state.device_traffic_history:
-        # First time seeing this device - I need to create its history
-        st.session_state.device_traffic_history[device_name] = {
-            'timestamps': [],           # I'll store datetime objects here
-            'download_speeds': [],      # I'll store download speeds here
-            'upload_speeds': []         # I'll store upload speeds here
-        }
-        # These lists start empty and grow over time
-
-    # I'm adding the current data point to this device's history
-    st.session_state.device_traffic_history[device_name]['timestamps'].append(current_time)
-    st.session_state.device_traffic_history[device_name]['download_speeds'].append(device['current_download_speed'])
-    st.session_state.device_traffic_history[device_name]['upload_speeds'].append(device['current_upload_speed'])
-    # .append() adds to the end of the list
-    # All three lists stay the same length (synchronized)
-
-    # -------------------------------------------------------------------------
-    # REMOVING OLD DATA (OLDER THAN 30 MINUTES)
-    # -------------------------------------------------------------------------
-    # I need to delete old data or my lists would grow forever
-    # My graph only shows 30 minutes anyway
-
-    cutoff_time = current_time - timedelta(minutes=30)
-    # timedelta(minutes=30) is a 30-minute duration
-    # I subtract it from now to get the cutoff time
-    # Example: If now is 6:00 PM, cutoff is 5:30 PM
-
-    history = st.session_state.device_traffic_history[device_name]
-    # I'm getting this device's history so I can clean it up
-
-    valid_indices = [i for i, t in enumerate(history['timestamps']) if t >= cutoff_time]
-    # I'm finding which data points are still within the 30-minute window
-    # enumerate gives me (index, value) pairs
-    # I keep only indices where timestamp >= cutoff
-    # This gives me a list of indices to keep
-
-    # I'm rebuilding the lists with only the valid indices
-    history['timestamps'] = [history['timestamps'][i] for i in valid_indices]
-    history['download_speeds'] = [history['download_speeds'][i] for i in valid_indices]
-    history['upload_speeds'] = [history['upload_speeds'][i] for i in valid_indices]
-    # These list comprehensions create new lists with only recent data
-    # This removes the old data from the front of the lists
-    # All three lists stay synchronized (same valid_indices)
+# Both live speed cards (download and upload) as one HTML grid
+# Only the two speeds change every tick, so everything else is fixed text
+# {download} and {upload} get filled in with the formatted speeds
+THROUGHPUT_CARDS_TEMPLATE = """
+    <div class='dash-grid' style='grid-template-columns: repeat(2, 1fr);'>
+        <div class='dash-card dash-speed dash-download'>
+            <div class='dash-label'>DOWNLOAD</div>
+            <div class='dash-value'>{download} Mbps</div>
+        </div>
+        <div class='dash-card dash-speed dash-upload'>
+            <div class='dash-label'>UPLOAD</div>
+            <div class='dash-value'>{upload} Mbps</div>
+        </div>
+    </div>
+"""
 
-# ----------------------------------------------------------------------------
-# SUBSECTION 6F: TRAFFIC HISTORY TRACKING (ALL DEVICES COMBINED)
-# ----------------------------------------------------------------------------
-# I'm also tracking the combined traffic for ALL devices together
-# This is what I show when the user picks "All Devices" in the dropdown
-
-if 'traffic_history' not in st.session_state:
-    # First run - I need to initialize this
-    st.session_state.traffic_history = {
-        'timestamps': [],
-        'download_speeds': [],
-        'upload_speeds': []
-    }
-    # Same structure as the per-device history
-
-# I'm calculating the total network speeds right now
-all_download_speed = df['current_download_speed'].sum()
-all_upload_speed = df['current_upload_speed'].sum()
-# I use .sum() to add up ALL devices (not the filtered data)
-# This is the total bandwidth for my whole network
-
-# I'm adding this data point to the overall history
-st.session_state.traffic_history['timestamps'].append(current_time)
-st.session_state.traffic_history['download_speeds'].append(all_download_speed)
-st.session_state.traffic_history['upload_speeds'].append(all_upload_speed)
-# Same pattern as the per-device history
-
-# I'm removing old data (older than 30 minutes)
-cutoff_time = current_time - timedelta(minutes=30)
-valid_indices = [i for i, t in enumerate(st.session_state.traffic_history['timestamps']) if t >= cutoff_time]
-st.session_state.traffic_history['timestamps'] = [st.session_state.traffic_history['timestamps'][i] for i in valid_indices]
-st.session_state.traffic_history['download_speeds'] = [st.session_state.traffic_history['download_speeds'][i] for i in valid_indices]
-st.session_state.traffic_history['upload_speeds'] = [st.session_state.traffic_history['upload_speeds'][i] for i in valid_indices]
 
 # ----------------------------------------------------------------------------
-# SUBSECTION 6G: SECURITY ALERT COLLECTION
+# DEVICE DETAIL CARDS (STEP 6.5)
 # ----------------------------------------------------------------------------
-# I'm collecting security alerts from my data generator
-# These are fake alerts (port scans, malware, etc.) to make my demo realistic
-
-new_alerts = st.session_state.traffic_generator.generate_security_alerts()
-# My data generator has a 20% chance of creating alerts each refresh
-# It returns a list of alert dictionaries
-# If no alerts, it returns an empty list []
-
-if new_alerts:
-    # If there are new alerts, I need to add them to my list
-
-    st.session_state.security_alerts = new_alerts + st.session_state.security_alerts
-    # I'm putting the new alerts at the BEGINNING of my list
-    # This way newest alerts appear first when I display them
-    # The + operator concatenates the lists
-
-# I'm limiting my alert list to 50 alerts max
-st.session_state.security_alerts = st.session_state.security_alerts[:50]
-# [:50] keeps only the first 50 alerts
-# If I have less than 50, nothing happens
-# If I have more than 50, the old ones get discarded
-# This stops my list from growing forever and using too much memory
-
-# ============================================================================
-# STEP 6.5: DEVICE DETAILS (Single Device View Only)
-# ============================================================================
-# I'm showing detailed device info when the user picks a specific device
-# This only appears for single devices, not "All Devices" view
-
-if selected_device != "All Devices" and selected_device_data:
-    # I check two things:
-    #   1. User picked a specific device (not "All Devices")
-    #   2. AND I successfully found that device's data
-    # Both have to be true for this to run
-
-    st.markdown(f"### {selected_device}")
-    # I'm displaying the device name as a heading
-    # The f-string inserts the actual device name
-
-    # I'm creating 4 columns for my detail cards
-    detail_col1, detail_col2, detail_col3, detail_col4 = st.columns(4)
-    # st.columns(4) creates 4 equal-width columns (25% each)
-    # I'll put one info card in each column
-
-    # -------------------------------------------------------------------------
-    # DETAIL CARD 1: IP ADDRESS
-    # -------------------------------------------------------------------------
-    with detail_col1:
-        # Everything in this 'with' block goes in the first column
-
-        st.markdown(
-            f"""
-            <div style='
-                background: #1a1a1a;
-                border: 1px solid #00d4ff;
-                border-radius: 8px;
-                padding: 15px;
-                text-align: center;
-            '>
-                <div style='color: #888; font-size: 12px; margin-bottom: 5px;'>IP ADDRESS</div>
-                <div style='color: white; font-size: 16px; font-weight: bold;'>{selected_device_data['ip']}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        # I'm using HTML/CSS to create a custom card
-        # My styling:
-        #   - Dark background to match my theme
-        #   - Cyan border (matches download color)
-        #   - Rounded corners
-        #   - Centered text
-        # The card shows "IP ADDRESS" label on top and the actual IP below
-        # This is the device's local network IP (like 192.168.1.5)
-
-    # -------------------------------------------------------------------------
-    # DETAIL CARD 2: MAC ADDRESS
-    # -------------------------------------------------------------------------
-    with detail_col2:
-        # This goes in the second column
-
-        st.markdown(
-            f"""
-            <div style='
-                background: #1a1a1a;
-                border: 1px solid #a855f7;
-                border-radius: 8px;
-                padding: 15px;
-                text-align: center;
-            '>
-                <div style='color: #888; font-size: 12px; margin-bottom: 5px;'>MAC ADDRESS</div>
-                <div style='color: white; font-size: 16px; font-weight: bold;'>{selected_device_data['mac']}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        # Same structure but with purple border (matches upload color)
-        # MAC address is the hardware ID burned into the network card
-        # Format is like AA:BB:CC:DD:EE:FF (6 pairs of hex digits)
-        # This can't be changed - it's like a serial number for the network card
-
-    # -------------------------------------------------------------------------
-    # DETAIL CARD 3: CONNECTION TYPE
-    # -------------------------------------------------------------------------
-    with detail_col3:
-        # This goes in the third column
-
-        # I'm picking a color based on the connection type
-        if selected_device_data['connection_type'] == "Wired":
-            connection_color = "#00d4ff"  # Cyan for wired
-        else:
-            connection_color = "#a855f7"  # Purple for Wi-Fi
-        # I broke this out instead of using a ternary operator
-        # My professor said simpler code is better even if it's longer
-
-        st.markdown(
-            f"""
-            <div style='
-                background: #1a1a1a;
-                border: 1px solid {connection_color};
-                border-radius: 8px;
-                padding: 15px;
-                text-align: center;
-            '>
-                <div style='color: #888; font-size: 12px; margin-bottom: 5px;'>CONNECTION</div>
-                <div style='color: white; font-size: 16px; font-weight: bold;'>{selected_device_data['connection_type']}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        # The border color changes based on connection type
-        # Wired gets cyan, Wi-Fi gets purple
-        # Shows whether device is plugged in (Wired) or wireless (Wi-Fi)
-
-    # -------------------------------------------------------------------------
-    # DETAIL CARD 4: STATUS
-    # -------------------------------------------------------------------------
-    with detail_col4:
-        # This goes in the fourth column
-
-        # I'm picking a color based on online/offline status
-        if selected_device_data['status'] == "ONLINE":
-            status_color = "#10b981"  # Green for online
-        else:
-            status_color = "#ef4444"  # Red for offline
-        # Green means good (online), red means bad (offline)
-
-        st.markdown(
-            f"""
-            <div style='
-                background: #1a1a1a;
-                border: 1px solid {status_color};
-                border-radius: 8px;
-                padding: 15px;
-                text-align: center;
-            '>
-                <div style='color: #888; font-size: 12px; margin-bottom: 5px;'>STATUS</div>
-                <div style='color: {status_color}; font-size: 16px; font-weight: bold;'>{selected_device_data['status']}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-        # The status text itself is colored (not just the border)
-        # "ONLINE" appears green, "OFFLINE" appears red
-        # This gives instant visual feedback on device state
+# The layout for one detail card
+# {border} and {text} are colors, {label} is the small gray title, and
+# {{{field}}} turns into {ip}, {mac}, etc. which I fill in with the device's info
+# (.strip() for the same reason as my metric card template)
+DETAIL_CARD_TEMPLATE = """
+        <div class='dash-card dash-detail' style='border-color: {border};'>
+            <div class='dash-label'>{label}</div>
+            <div class='dash-value' style='color: {text};'>{{{field}}}</div>
+        </div>
+""".strip()
 
-    st.markdown("---")
-    # I'm adding a horizontal line to separate sections
-    # Makes the layout cleaner
+# The connection card's border color: cyan for wired, purple for Wi-Fi
+CONNECTION_COLORS = {"Wired": "#00d4ff", "Wi-Fi": "#a855f7"}
 
-# ============================================================================
-# STEP 7: DISPLAY METRICS (TOP ROW)
-# ============================================================================
-# I'm showing summary statistics at the top of my dashboard
-# These give users a quick overview of the network status
-# The numbers change based on what the user selected in the dropdown
-
-# I'm creating 3 columns for my metric cards
-col1, col2, col3 = st.columns(3)
-# st.columns(3) splits the width into three equal parts
-# Each column gets one metric card
-
-# I'm displaying the three metrics
-col1.metric("Connected Devices", total_devices)
-# This shows how many devices are currently online
-# I calculated this number earlier in STEP 6C
-# For "All Devices": shows total online devices
-# For single device: shows 1 (online) or 0 (offline)
-
-col2.metric("Total Download", f"{total_download:.2f} MB")
-# This shows the cumulative download traffic
-# I'm using an f-string with :.2f to format to 2 decimal places
-# So 156.789 becomes "156.79 MB"
-# This is the total downloaded (not current speed)
-
-col3.metric("Total Upload", f"{total_upload:.2f} MB")
-# Same idea but for upload traffic
-# Upload is usually lower than download
-# Most internet connections are asymmetric (more download than upload)
+# The status card's border and text color: green means good, red means bad
+STATUS_COLORS = {"ONLINE": "#10b981", "OFFLINE": "#ef4444"}
 
-# ============================================================================
-# STEP 7.25: LIVE THROUGHPUT DISPLAY
-# ============================================================================
-# I'm showing the CURRENT network speeds (not totals)
-# These are the live speeds happening right now
-# Measured in Mbps (megabits per second)
 
-st.markdown("### Live Throughput")
-# I'm adding a heading for this section
-# "Live" tells users this is real-time, not historical
+def _detail_cards_html(connection_color, status_color):
+    """Builds all 4 detail cards as one HTML grid for one pair of colors"""
+    return (
+        "<div class='dash-grid' style='grid-template-columns: repeat(4, 1fr);'>"
+        + DETAIL_CARD_TEMPLATE.format(border="#00d4ff", label="IP ADDRESS", text="white", field="ip")
+        + DETAIL_CARD_TEMPLATE.format(border="#a855f7", label="MAC ADDRESS", text="white", field="mac")
+        + DETAIL_CARD_TEMPLATE.format(border=connection_color, label="CONNECTION", text="white", field="connection_type")
+        + DETAIL_CARD_TEMPLATE.format(border=status_color, label="STATUS", text=status_color, field="status")
+        + "</div>"
+    )
 
-# I'm creating 2 columns for download and upload speeds
-throughput_col1, throughput_col2 = st.columns(2)
-# 50/50 split for side-by-side display
-# Download on left, upload on right
 
-# ----------------------------------------------------------------------------
-# LIVE DOWNLOAD SPEED CARD
-# ----------------------------------------------------------------------------
-with throughput_col1:
-    # This goes in the left column
+DETAIL_CARDS = {
+    (connection_type, status): _detail_cards_html(connection_color, status_color)
+    for connection_type, connection_color in CONNECTION_COLORS.items()
+    for status, status_color in STATUS_COLORS.items()
+}
+# A lookup table with the finished HTML for every (connection type, status) pair
+# There are only 2 x 2 = 4 of them, so I build them all once up here
+# Then showing a device is one dictionary lookup plus filling in its info,
+# instead of picking colors with if/else and building 4 f-strings every tick
 
-    st.markdown(
-        f"""
-        <div style='
-            background: #1a1a1a;
-            border: 1px solid #00d4ff;
-            border-radius: 8px;
-            padding: 20px;
-            text-align: center;
-        '>
-            <div style='color: #888; font-size: 14px; margin-bottom: 10px;'>DOWNLOAD</div>
-            <div style='color: #00d4ff; font-size: 36px; font-weight: bold;'>{current_download_speed:.2f} Mbps</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    # I'm using HTML/CSS for a custom card with cyan styling
-    # I made the font size really big (36px) so users can see it easily
-    # The speed is in Mbps (megabits per second)
-    # Note: Mbps is different from MB/s (megabytes per second)
-    # 8 Mbps = 1 MB/s because 1 byte = 8 bits
-    # ISPs use Mbps because the numbers are bigger
 
 # ----------------------------------------------------------------------------
-# LIVE UPLOAD SPEED CARD
+# BUILD THE SPEED GRAPH ONCE AND REUSE IT
 # ----------------------------------------------------------------------------
-with throughput_col2:
-    # This goes in the right column
-
-    st.markdown(
-        f"""
-        <div style='
-            background: #1a1a1a;
-            border: 1px solid #a855f7;
-            border-radius: 8px;
-            padding: 20px;
-            text-align: center;
-        '>
-            <div style='color: #888; font-size: 14px; margin-bottom: 10px;'>UPLOAD</div>
-            <div style='color: #a855f7; font-size: 36px; font-weight: bold;'>{current_upload_speed:.2f} Mbps</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-    # Same structure but with purple color (matches upload theme)
-    # Side-by-side lets users compare download vs upload easily
-    # Upload is typically much lower than download
-
-# ============================================================================
-# STEP 7.5: NETWORK SPEED GRAPH (30-MINUTE HISTORY)
-# ============================================================================
-# I'm creating a graph that shows network speeds over the last 30 minutes
-# This lets users see trends and patterns in their network usage
-# I'm tracking this data in STEP 6E (per device) and STEP 6F (all devices)
-
-st.markdown("### Network Throughput (Last 30 Minutes)")
-# I'm adding a heading for the graph section
-# The "Last 30 Minutes" tells users the time window
-
-# I'm picking which history data to show
-if selected_device != "All Devices" and selected_device in st.session_state.device_traffic_history:
-    # User picked a specific device AND I have history for it
-    # So I show just that device's traffic
-
-    history_data = st.session_state.device_traffic_history[selected_device]
-    # This gets me the timestamps and speeds for just this device
-else:
-    # Either user picked "All Devices" OR the device doesn't have history yet
-    # So I show the combined network traffic
-
-    history_data = st.session_state.traffic_history
-    # This has the summed-up traffic from all devices
-
-# I only show the graph if I have data to plot
-if len(history_data['timestamps']) > 0:
-    # I'm checking if there's any data collected yet
-    # On first run the lists are empty
-    # After a few refreshes I'll have data points to graph
+# Building a Plotly figure (traces, colors, layout, legend) is a lot of Python
+# work, and before I was redoing all of it on every refresh even though only the
+# data changes. So I build the styled figure once and just swap in the new x/y
+# data each time.
+# Each browser session keeps its own figures in st.session_state, since I change
+# the lines in place and every session has its own history and device pick
+# (my map is different: every session shows the same connections, so it shares
+# one figure behind a lock - see _get_map_state())
+
+def _make_speed_fig():
+    """
+    Builds the styled throughput figure with two empty lines (download, upload)
+    """
     # -------------------------------------------------------------------------
     # CREATE PLOTLY FIGURE OBJECT
     # -------------------------------------------------------------------------
@@ -1097,19 +905,20 @@ if len(history_data['timestamps']) > 0:
     # -------------------------------------------------------------------------
     # ADD DOWNLOAD SPEED LINE (CYAN)
     # -------------------------------------------------------------------------
-    fig_speed.add_trace(go.Scatter(
+    fig_speed.add_trace(go.Scattergl(
         # I'm adding a line for download speeds
-        # go.Scatter can make scatter plots or line plots
+        # go.Scattergl is the WebGL version of go.Scatter
+        # It draws into one canvas instead of making an SVG element per point,
+        # so the browser doesn't freeze when the history gets long
 
-        x=history_data['timestamps'],
+        x=[],
         # x-axis is time
-        # This is my list of datetime objects
+        # It starts empty - I fill in the timestamps on every refresh
         # Plotly formats these nicely as time labels
 
-        y=history_data['download_speeds'],
+        y=[],
         # y-axis is speed in MB/s
-        # This is my list of download speeds
-        # Each speed corresponds to a timestamp (same index)
+        # Also empty until I fill in the download speeds
 
         mode='lines',
         # I'm using 'lines' mode to connect the points
@@ -1120,34 +929,34 @@ if len(history_data['timestamps']) > 0:
         # This is the label that shows in the legend
         # Users can click it to hide/show the line
 
-        line=dict(color='#00d4ff', width=2),
-        # I'm styling the line cyan (#00d4ff) to match my download theme
-        # width=2 makes it 2 pixels thick
-        # dict() creates the styling dictionary
+        line=DOWNLOAD_LINE,
+        # Cyan, 2 pixels thick (the style dicts live in dashboard_config.py)
 
         fill='tozeroy',
         # I'm filling the area under the line
         # 'tozeroy' means fill down to the x-axis (y=0)
         # This makes it look like professional dashboards
 
-        fillcolor='rgba(0, 212, 255, 0.2)'
-        # I'm making the fill cyan but transparent (20% opacity)
-        # rgba is Red, Green, Blue, Alpha (transparency)
-        # I need transparency so you can see both fills when they overlap
+        fillcolor=DOWNLOAD_FILL
+        # See-through cyan so you can see both fills when they overlap
     ))
 
     # -------------------------------------------------------------------------
     # ADD UPLOAD SPEED LINE (PURPLE)
     # -------------------------------------------------------------------------
-    fig_speed.add_trace(go.Scatter(
-        # I'm adding a second line for upload speeds
+    fig_speed.add_trace(go.Scattergl(
+        # I'm adding a second line for upload speeds (also WebGL)
         # Both lines show on the same graph
+        # I looked at merging both lines into one trace with a NaN gap in the
+        # middle, but a trace can only have one line color and one fill, so I'd
+        # lose my cyan/purple areas. Plotly's per-trace cost only matters with
+        # lots of traces anyway, and I only have two.
 
-        x=history_data['timestamps'],
-        # Same timestamps as download (shared time axis)
+        x=[],
+        # Same time axis as download (filled in on every refresh)
 
-        y=history_data['upload_speeds'],
-        # Upload speeds (usually lower than download)
+        y=[],
+        # Upload speeds (usually lower than download), also filled in later
 
         mode='lines',
         # Same line mode
@@ -1155,16 +964,14 @@ if len(history_data['timestamps']) > 0:
         name='Upload',
         # This shows "Upload" in the legend
 
-        line=dict(color='#a855f7', width=2),
-        # I'm using purple for upload (consistent with my theme)
-        # Same 2px width as download
+        line=UPLOAD_LINE,
+        # Purple for upload (consistent with my theme), same 2px width
 
         fill='tozeroy',
         # Fill under this line too
 
-        fillcolor='rgba(168, 85, 247, 0.2)'
-        # Purple fill at 20% opacity
-        # RGB values match the purple hex color
+        fillcolor=UPLOAD_FILL
+        # See-through purple, same opacity as download
     ))
 
     # -------------------------------------------------------------------------
@@ -1178,6 +985,9 @@ if len(history_data['timestamps']) > 0:
         # Label for the x-axis (horizontal)
         # Tells users this axis is time
 
+        xaxis_type='date',
+        # My x values are milliseconds since 1970, so I tell Plotly to show them as times
+
         yaxis_title="Speed (MB/s)",
         # Label for the y-axis (vertical)
         # MB/s = megabytes per second
@@ -1185,288 +995,674 @@ if len(history_data['timestamps']) > 0:
         hovermode='x unified',
         # I'm setting how tooltips work when you hover
         # 'x unified' shows both download and upload in one tooltip
-        # This way users can see both speeds at the same time
+        # LTTB keeps each line at ~800 points at most, so this stays smooth
+        # even with a full 30 minutes of history
+
+        spikedistance=0,
+        # I'm turning off the spike-line search
+        # Otherwise Plotly checks every point on every mouse move, which gets slow
+
+        hoverdistance=50,
+        # Plotly only looks for points within 50 pixels of the mouse
 
         height=400,
         # I'm setting the graph height to 400 pixels
         # This makes it big enough to see but doesn't take over the page
 
-        margin=dict(l=0, r=0, t=0, b=0),
-        # I'm setting all margins to 0
-        # Streamlit adds its own padding so I don't need extra
-        # dict creates the margin dictionary
-
-        legend=dict(
-            # I'm configuring the legend box
+        margin=SPEED_MARGIN,
+        # All margins 0 - Streamlit adds its own padding so I don't need extra
 
-            orientation="h",
-            # "h" means horizontal (items side-by-side)
-            # This saves vertical space
-
-            yanchor="bottom",
-            # This sets the anchor point for positioning
-
-            y=1.02,
-            # I'm placing it slightly above the graph
-            # 1.0 = top of graph, 1.02 = a bit above
-            # This way it doesn't cover my data
-
-            xanchor="right",
-            # Anchor for horizontal positioning
-
-            x=1
-            # I'm placing it at the right edge
-            # Combined with the anchors, this puts it top-right
-        )
+        legend=SPEED_LEGEND
+        # Horizontal legend in the top-right corner, just above the graph
     )
 
-    # -------------------------------------------------------------------------
-    # DISPLAY THE COMPLETED GRAPH
-    # -------------------------------------------------------------------------
-    st.plotly_chart(fig_speed, use_container_width=True)
-    # I'm displaying the graph I created
-    # use_container_width=True makes it fill the available width
-    # Plotly charts are interactive:
-    #   - Hover to see values
-    #   - Click legend to hide/show lines
-    #   - Drag to zoom, double-click to reset
+    return fig_speed
+    # I return the empty figure, and render_throughput() keeps it for next time
 
-else:
-    # This runs if I don't have any data yet
-    # Happens on first load before any refreshes
+def render_throughput(selected_device, current_time_ns, detailed_graph):
+    """
+    Draws the 30-minute throughput graph for the selected device (or all devices)
 
-    st.info("Collecting data... Graph will appear after a few updates.")
-    # I'm showing a message so users know why the graph isn't there yet
-    # After a few refreshes I'll have data and the graph will show
+    current_time_ns is when the live panel recorded this refresh's data point
+    (time.monotonic_ns(), the same clock as the timestamps in my ring buffers)
+    detailed_graph picks my Plotly graph instead of Streamlit's own area chart
+    The graph only reads the history I already saved in session state
+    """
+    st.markdown("### Network Throughput (Last 30 Minutes)")
+    # I'm adding a heading for the graph section
+    # The "Last 30 Minutes" tells users the time window
 
-# ============================================================================
-# STEP 8: DEVICES CURRENTLY CONNECTED
-# ============================================================================
-# I'm showing a table with all the device information
-# This is an interactive table users can sort and scroll
-# The table changes based on whether they picked "All Devices" or a single device
-
-# I'm changing the header based on what's selected
-if selected_device != "All Devices":
-    # User picked one device - use singular
-    st.subheader("Current Device")
-    # "Current" makes it clear this is the one they picked
-else:
-    # User is viewing all devices - use plural
-    st.subheader("Devices Currently Connected")
-    # This tells users they're seeing all connected devices
-
-# I'm selecting which columns to show in the table
-# My DataFrame has lots of columns but I don't need all of them
-display_df = df_filtered[[
-    # I'm using double brackets to select multiple columns
-    # This returns a new DataFrame with just these columns
-
-    'name',              # Device name like "Home PC" or "iPhone"
-    'type',              # Device type (Desktop, Mobile, Tablet, IoT)
-    'ip',                # Local network IP address
-    'mac',               # MAC address (hardware ID)
-    'connection_type',   # Wired or Wi-Fi
-    'status',            # ONLINE or OFFLINE
-    'Download (MB)',     # Total download traffic
-    'Upload (MB)',       # Total upload traffic
-    'last_seen'          # Last activity timestamp
-]]
-# These 9 columns have all the important info users need
-# The order here is the order they appear left to right
-
-# I'm displaying the table
-st.dataframe(
-    # st.dataframe() creates an interactive table
-    # Users can sort by clicking column headers
-
-    display_df,
-    # This is the DataFrame I created above with 9 columns
-
-    use_container_width=True,
-    # This makes the table fill the available width
-    # Without this it would be narrow and hard to read
-
-    column_config={
-        # I'm customizing how each column looks
-
-        "name": "Device Name",
-        # Renaming for clarity
-
-        "type": "Type",
-        # Capitalizing it
-
-        "ip": "IP Address",
-        # Expanding the abbreviation
-
-        "mac": "MAC Address",
-        # MAC = Media Access Control
-
-        "connection_type": "Connection",
-        # Shortening to save space
-
-        "status": "Status",
-        # This is already clear
-
-        "Download (MB)": st.column_config.NumberColumn("Download (MB)", format="%.2f MB"),
-        # I'm using NumberColumn to format the numbers nicely
-        # %.2f means 2 decimal places
-        # So 5.234567 becomes "5.23 MB"
-
-        "Upload (MB)": st.column_config.NumberColumn("Upload (MB)", format="%.2f MB"),
-        # Same formatting for upload
-
-        "last_seen": "Last Seen"
-        # Making it look nicer with capitals and space
-    },
-
-    hide_index=True
-    # I'm hiding the row numbers (0, 1, 2...)
-    # They're not useful here and make the table cluttered
-)
+    # I'm picking which history data to show
+    cutoff_ns = current_time_ns - HISTORY_WINDOW_NS
+    # The 30-minute cutoff is plain integer math on nanoseconds
+    # (no datetime or timedelta objects involved)
 
-# ============================================================================
-# STEP 9: GLOBAL TRAFFIC MAP (PLOTLY) - Only show for "All Devices"
-# ============================================================================
-# I'm creating a world map showing where external servers are located
-# This only shows for "All Devices" view (not single device)
-# It helps users see if connections are coming from unexpected places
+    history = st.session_state.device_traffic_history
+    # My per-device ring buffer - it belongs to this viewer, so it stays in
+    # session_state (only the shared generator lives in st.cache_resource)
 
-if selected_device == "All Devices":
-    # Map only shows for "All Devices" view
-    # It doesn't make sense for single device view
+    if selected_device != "All Devices":
+        # User picked a specific device, so I show just that device's traffic
+        device_index = get_device_options().index(selected_device) - 1
+        # Its column in my per-device history (same order as the generator's devices)
+        # My cached dropdown options already list the devices in that order,
+        # just with "All Devices" in front, so I subtract 1
+        # (asking the generator would build a new tuple of names every time)
+
+        ts_int, download_arr, upload_arr = history.since(cutoff_ns, device=device_index)
+    else:
+        # User picked "All Devices", so I show the combined network traffic
+        ts_int, download_arr, upload_arr = history.since(cutoff_ns)
+        # Without a device, since() adds up every device's speeds for me
+
+    # Both views come from the same ring buffer (see traffic_history.py)
+    # since() gives me only the last 30 minutes, oldest first
+
+    local_ns = ts_int + MONOTONIC_TO_LOCAL_NS
+    # My timestamps are monotonic clock readings, so I shift them onto my
+    # local clock here, only for the time axis (one array add, no datetimes)
+
+    # I only show the graph if I have data to plot
+    if len(ts_int) > 0:
+        # I'm checking if there's any data collected yet
+        # On first run the lists are empty
+        # After a few refreshes I'll have data points to graph
+
+        # -------------------------------------------------------------------------
+        # DOWNSAMPLE THE HISTORY (LTTB)
+        # -------------------------------------------------------------------------
+        # At a 1 second refresh I can have up to 1,800 points per line
+        # I shrink each line to ~800 points with LTTB so the chart draws and hovers faster
+        # LTTB keeps the spikes and dips, so the graph still looks the same
+        dl_idx = lttb_indices(ts_int, download_arr)
+        ul_idx = lttb_indices(ts_int, upload_arr)
+        # Each line keeps its own points, so download and upload get their own indices
+
+        if not detailed_graph:
+            # -----------------------------------------------------------------
+            # STREAMLIT'S OWN AREA CHART (DEFAULT)
+            # -----------------------------------------------------------------
+            chart_idx = np.union1d(dl_idx, ul_idx)
+            # Both lines have to share one time column in a table, so I keep
+            # every point that either line's downsampling kept (already sorted)
+
+            speed_table = pd.DataFrame(
+                {
+                    'Download': download_arr[chart_idx],
+                    'Upload': upload_arr[chart_idx]
+                },
+                index=local_ns[chart_idx].view('datetime64[ns]')
+            )
+            # One row per point in time, one column per line
+            # The index is my int64 nanoseconds read as datetime64[ns] (the same
+            # 8 bytes per point), so pandas doesn't have to convert anything
+            # to get real times for the x-axis
+
+            st.area_chart(
+                speed_table,
+                color=[DOWNLOAD_LINE['color'], UPLOAD_LINE['color']],
+                # Same cyan and purple as my Plotly lines
+                stack=False,
+                # stack=False draws the two areas on top of each other (like my
+                # Plotly fills) instead of piling upload on top of download
+                x_label="Time",
+                y_label="Speed (MB/s)",
+                height=400
+            )
+            # Streamlit sends this to the browser as an Arrow table, which is
+            # much smaller than a whole Plotly figure
+            return
+            # That's all for the default graph
+
+        # -------------------------------------------------------------------------
+        # FILL THE CACHED FIGURE WITH THIS REFRESH'S DATA (DETAILED GRAPH)
+        # -------------------------------------------------------------------------
+        download_ms = (local_ns[dl_idx] // 1_000_000).astype(np.float64)
+        # Plotly's date axis understands plain numbers as milliseconds since 1970
+        # If I passed datetimes, Plotly would turn every one into a text string;
+        # plain number arrays get sent to the browser as compact binary instead
+        # (float64 holds millisecond timestamps exactly, int64 isn't supported)
+        # I only convert the points LTTB kept, not the whole 30 minutes
+
+        if np.array_equal(ul_idx, dl_idx):
+            upload_ms = download_ms
+            # Until the history is longer than LTTB's target, both lines keep
+            # every point, so they can share one time array
+        else:
+            upload_ms = (local_ns[ul_idx] // 1_000_000).astype(np.float64)
+
+        if 'speed_figs' not in st.session_state:
+            st.session_state.speed_figs = {}
+            # One figure per device view (plus "All Devices"), built the first time it's shown
+
+        if selected_device not in st.session_state.speed_figs:
+            st.session_state.speed_figs[selected_device] = _make_speed_fig()
+
+        fig_speed = st.session_state.speed_figs[selected_device]
+        # I get my pre-built figure back (it's only built once per device view)
+
+        with fig_speed.batch_update():
+            # batch_update() lets me change both lines in one go
+
+            fig_speed.data[0].x = download_ms
+            fig_speed.data[0].y = download_arr[dl_idx]
+            # Trace 0 is the download line (cyan)
+            # These are the downsampled timestamps and speeds
+            # Both are NumPy arrays (float64 and float32), so Plotly sends them as
+            # typed binary arrays instead of a long JSON list of numbers
+            # float32 is the smallest float Plotly can send (it can't do float16),
+            # so the 2-byte speeds only live in my history (see traffic_history.py)
+
+            fig_speed.data[1].x = upload_ms
+            fig_speed.data[1].y = upload_arr[ul_idx]
+            # Trace 1 is the upload line (purple)
+            # The upload line keeps its own downsampled points
+
+        # -------------------------------------------------------------------------
+        # DISPLAY THE COMPLETED GRAPH
+        # -------------------------------------------------------------------------
+        st.plotly_chart(fig_speed, use_container_width=True, key="speed_chart")
+        # I'm displaying the graph I created
+        # use_container_width=True makes it fill the available width
+        # key="speed_chart" keeps it the same chart element from tick to tick,
+        # so the browser updates the chart it has instead of making a new one
+        # Plotly charts are interactive:
+        #   - Hover to see values
+        #   - Click legend to hide/show lines
+        #   - Drag to zoom, double-click to reset
 
-    st.markdown("### Global Traffic Origins")
-    # I'm adding a heading for the map section
+    else:
+        # This runs if I don't have any data yet
+        # Happens on first load before any refreshes
 
-    st.markdown("Live map of external servers communicating with your network.")
-    # I'm explaining what the map shows
-    # External servers = computers outside the local network
-    # Like websites, cloud services, etc.
+        st.info("Collecting data... Graph will appear after a few updates.")
+        # I'm showing a message so users know why the graph isn't there yet
+        # After a few refreshes I'll have data and the graph will show
 
-    # -------------------------------------------------------------------------
-    # FETCH CONNECTION DATA
-    # -------------------------------------------------------------------------
-    connections = st.session_state.traffic_generator.generate_external_connections()
-    # I'm getting fake connection data from my data generator
-    # Each connection has a latitude and longitude
-    # My generator makes realistic distribution:
-    #   - 50% United States (most traffic)
-    #   - 10% China
-    #   - 10% Russia
-    #   - 30% European Union
-    # This simulates real global internet patterns
 
-    # I'm converting to a DataFrame for Plotly
-    map_df = pd.DataFrame(connections)
-    # Plotly needs DataFrame format (not list of dicts)
-    # This creates a table with 'lat' and 'lon' columns
-    # Each row is one connection point on the map
+# When Live Updates are on, the live panel reruns every refresh_rate seconds
+# (1-10 seconds from the sidebar slider, see LIVE_RUN_EVERY). When they're
+# off it doesn't rerun on its own - it only updates when the user changes something
+#
+# What reruns on its own when Live Updates are on:
+#   - live_panel() (below): the device numbers, the graph and the devices table
+#   - render_alerts() (STEP 8.5): the alerts table, on the same timer
+#   - render_map() (STEP 9): the map, on its own slower timer that follows
+#     how often new connections come in (see connection_feed.py)
+# Everything else (header, CSS, sidebar) only runs when the user changes a
+# control. I keep the devices table in the live panel on purpose - its byte
+# totals and "Last Seen" change every tick, so it would go stale outside it
+
+
+@st.fragment(run_every=LIVE_RUN_EVERY)
+def live_panel(selected_device, show_charts, detailed_graph):
+    """
+    Fetches the newest device data and draws STEPS 5-8
+
+    This is its own fragment, so its timer reruns only this function
+    My session_state (traffic history, alerts, etc.) persists across
+    the reruns, so the history keeps growing instead of resetting
+    """
+    # ============================================================================
+    # STEP 5: FETCH CURRENT DEVICE DATA
+    # ============================================================================
+    # I'm calling my traffic generator to get the current device data
+    # This updates all the simulated traffic, device statuses, and timestamps
+    # It returns a list of dictionaries (one dictionary per device) plus the
+    # numeric fields already packed into NumPy arrays (see data_generator.py)
+
+    tick_number, devices, device_arrays, new_alerts = get_traffic_generator().tick()
+    # One call hands back the newest step of the shared simulation: its devices,
+    # the same data as NumPy arrays, and that step's security alerts
+    # The generator only moves forward once a second no matter how many tabs
+    # are open, so everyone gets the same step back until the next one
+    # My data generator has a 20% chance of creating alerts each step
+    # new_alerts is a list of alert dictionaries (or an empty list [])
+
+    if tick_number != st.session_state.get('alerts_tick'):
+        st.session_state.security_alerts.add(new_alerts)
+        # The log puts the new alerts first and only keeps the 50 newest
+        # The alerts panel in STEP 8.5 shows them
+        st.session_state.alerts_tick = tick_number
+        # Every full run of my script (like changing the dropdown) also runs
+        # this panel and can get the same step back, so I remember which step's
+        # alerts I already added and never add them twice
+
+    # ============================================================================
+    # STEP 6: PROCESS AND TRANSFORM RAW DEVICE DATA
+    # ============================================================================
+    # I'm taking my device data and transforming it into a more usable format
+    # My data generator gives me a list of dictionaries (one per device)
+    # I only need a few numbers out of it for my metrics, and my generator
+    # already gives me each of those fields as its own NumPy array, so I never
+    # build a whole pandas DataFrame (or loop over the dicts) here
+    # (the devices table in STEP 8 is built from these arrays too)
+
+    device_names = device_arrays['name']
+    device_online = device_arrays['online']
+    traffic_bytes = device_arrays['traffic_bytes']
+    speeds = device_arrays['speeds']
+    download_speeds = device_arrays['current_download_speed']
+    upload_speeds = device_arrays['current_upload_speed']
+    # traffic_bytes and speeds each hold two rows (download, then upload),
+    # so I can add up download and upload together in one pass below
+    # download_speeds and upload_speeds are just the rows of speeds
+    # One array per field, in the same device order
+    # device_online is True/False instead of the "ONLINE"/"OFFLINE" text
+    # Example: traffic_bytes[0, 0] is the first device's total download
+    # The speeds only get shown with 2 decimals, so float32 (4 bytes) is plenty
+    # The byte totals keep growing forever, so they stay int64 - they'd overflow
+    # a uint32 (about 4 GB) after a few hundred refreshes of router traffic
+
+    # ----------------------------------------------------------------------------
+    # SUBSECTION 6A: UNIT CONVERSION (BYTES TO MEGABYTES)
+    # ----------------------------------------------------------------------------
+    # I'm converting the traffic from bytes to megabytes
+    # Bytes are too small to read easily (like 5,242,880 bytes)
+    # Megabytes are much cleaner (5.00 MB)
+
+    # BYTES_PER_MB comes from data_generator.py (1024 * 1024, not 1,000,000)
+    # My professor taught us that computers use binary:
+    #   - 1 KB = 1,024 bytes (not 1,000)
+    #   - 1 MB = 1,024 KB = 1,048,576 bytes total
+    # I only convert the totals in 6C (adding up first, then dividing once)
+    # The per-device MB numbers for the devices table in STEP 8 already come
+    # converted from the generator (device_arrays['traffic_mb'])
+
+    # ----------------------------------------------------------------------------
+    # SUBSECTION 6B: DATA FILTERING BASED ON USER SELECTION
+    # ----------------------------------------------------------------------------
+    # I'm filtering my data based on what the user picked in the dropdown
+    # If they picked a specific device, I only show that device's data
+    # If they picked "All Devices", I show everything
 
-    # -------------------------------------------------------------------------
-    # CREATE PLOTLY GEOGRAPHIC SCATTER PLOT
-    # -------------------------------------------------------------------------
-    fig = px.scatter_geo(
-        # I'm creating a scatter plot on a world map
-        # px.scatter_geo() is from plotly.express (easier to use)
-        # Each connection appears as a dot on the map
+    if selected_device != "All Devices":
+        # User picked a specific device
+        # I need to filter my arrays to just that one device
 
-        map_df,
-        # My DataFrame with lat/lon data
+        selected_mask = device_names == selected_device
+        # I'm creating a boolean mask where True = name matches
+        # I use it below to only add up this device's numbers
 
-        lat='lat',
-        # Column name for latitude
-        # Latitude goes from -90 (South Pole) to +90 (North Pole)
+        # I'm extracting that device's full info for the details panel
+        # My generator already gives me each device as a dictionary, so I just
+        # look it up in that list instead of pulling a row back out of pandas
+        # (df_filtered.iloc[0].to_dict() built a whole Series just to get 4 fields)
+        selected_device_data = None
+        # Stays None if the device doesn't exist (this shouldn't happen but I'm being safe)
 
-        lon='lon',
-        # Column name for longitude
-        # Longitude goes from -180 (West) to +180 (East)
+        for device in devices:
+            if device['name'] == selected_device:
+                selected_device_data = device
+                # This gives me all the device info: IP, MAC, status, etc.
+                break  # Found it, stop looking
+    else:
+        # User picked "All Devices" - I show everything
+        selected_mask = True
+        # Every device counts, so instead of an all-True array I just use True
+        # True is NumPy's default for where=, so my sums below take the plain
+        # unfiltered path and don't check a mask for every device
 
-        projection='equirectangular',
-        # This is the map projection (how I flatten the globe to 2D)
-        # equirectangular is a simple rectangular grid
-        # It's familiar looking but distorts size near the poles
+        selected_device_data = None
+        # No single device to show details for
+
+    # ----------------------------------------------------------------------------
+    # SUBSECTION 6C: CALCULATE AGGREGATE STATISTICS
+    # ----------------------------------------------------------------------------
+    # I'm calculating summary stats that I'll display at the top of my dashboard
+    # These calculations use my filtered data, so they change based on user selection
+
+    total_devices = np.count_nonzero(device_online & selected_mask)
+    # I'm counting how many online devices there are
+    # device_online is already True/False for each device (no text comparison),
+    # & keeps only the selected ones, and count_nonzero() counts the Trues
+    # I combine the two masks instead of pulling out a smaller array first,
+    # so nothing gets copied just to be counted
+    # If viewing all devices: this is total online devices
+    # If viewing one device: this is 1 (if online) or 0 (if offline)
+
+    total_download, total_upload = traffic_bytes.sum(axis=1, where=selected_mask) / BYTES_PER_MB
+    # I'm adding up all the download and upload traffic and converting it to MB
+    # axis=1 adds along each row, so I get [download total, upload total]
+    # from one sum and one division instead of two of each
+    # where=selected_mask only adds up the selected devices (again without copying)
+    # For "All Devices": this is total network traffic
+    # For single device: this is that device's traffic
+
+    # ----------------------------------------------------------------------------
+    # SUBSECTION 6D: EXTRACT CURRENT SPEEDS FOR LIVE DISPLAY
+    # ----------------------------------------------------------------------------
+    # I'm getting the current speeds (not cumulative totals)
+    # These are the live MB/s values I show in the big speed cards
+
+    current_download_speed, current_upload_speed = speeds.sum(axis=1, where=selected_mask)
+    # These are the current download and upload speeds from my data generator
+    # They represent what's happening right now (not total over time)
+    # I use .sum() to add up all devices (for "All Devices" view)
+    # For single device view, it's just that device's speeds
+    # Same two-row trick as the totals, and the throughput cards in STEP 7.25
+    # reuse these two numbers
+
+    # ----------------------------------------------------------------------------
+    # SUBSECTION 6E: TRAFFIC HISTORY TRACKING (PER-DEVICE)
+    # ----------------------------------------------------------------------------
+    # I'm tracking historical speed data for each device over time
+    # This is what I use for my 30-minute throughput graph
+    # I store it in session_state so it doesn't reset on every refresh
+
+    # The history itself gets created once per session in STEP 3
+
+    # I'm getting the current time to timestamp this data point
+    current_time_ns = time.monotonic_ns()
+    # This is already an int64-sized count of nanoseconds, which is how my
+    # ring buffers store it, so there's no date or time zone work every refresh
+    # The monotonic clock never jumps backwards (like when the computer's clock
+    # gets corrected), so my 30-minute cutoff always stays right
+    # I reuse it for every device (and the graph)
+
+    st.session_state.device_traffic_history.append(current_time_ns, download_speeds, upload_speeds)
+    # I'm recording every device's current speed with one write
+    # If the last sample is less than 0.9 seconds old (like when the user
+    # clicks around between ticks) the history skips this one, so quick
+    # clicking can't crowd the oldest minutes out of my 30-minute window
+    # download_speeds and upload_speeds are my arrays from the top of STEP 6
+    # I used to loop over the devices and append to three Python lists each,
+    # then rebuild all of them to throw away points older than 30 minutes
+    # The ring buffer overwrites its oldest row once it's full instead,
+    # and since() cuts off anything older than 30 minutes when I read it
+
+    # ----------------------------------------------------------------------------
+    # SUBSECTION 6F: TRAFFIC HISTORY TRACKING (ALL DEVICES COMBINED)
+    # ----------------------------------------------------------------------------
+    # I used to keep a second ring buffer with the total for ALL devices and
+    # write to it every tick too. But the total is just every device's speeds
+    # added up, and my per-device history already has all of them
+    # So now the "All Devices" graph adds up the device columns when it reads
+    # the history (see since() in traffic_history.py) and I only write once
+
+    # ============================================================================
+    # STEP 6.5: DEVICE DETAILS (Single Device View Only)
+    # ============================================================================
+    # I'm showing detailed device info when the user picks a specific device
+    # This only appears for single devices, not "All Devices" view
+
+    details_slot = st.empty()
+    # I always reserve one spot on the page for the details, even in the
+    # "All Devices" view where it stays empty
+    # Streamlit matches elements up by their position on the page, so without
+    # this slot everything below (my metric cards, the graph, the table) would
+    # shift down one spot when a device is picked and get rebuilt in the browser
+    # With the slot there, switching devices only swaps what's inside it
+
+    with details_slot.container():
+        # Everything drawn inside this "with" block goes into my slot
+        if selected_device != "All Devices" and selected_device_data:
+            # I check two things:
+            #   1. User picked a specific device (not "All Devices")
+            #   2. AND I successfully found that device's data
+            # Both have to be true for this to run
+
+            st.markdown(f"### {selected_device}")
+            # I'm displaying the device name as a heading
+            # The f-string inserts the actual device name
 
-        title='',
-        # No title because I already added one with st.markdown()
+            st.markdown(
+                DETAIL_CARDS[(selected_device_data['connection_type'], selected_device_data['status'])]
+                .format_map(selected_device_data),
+                unsafe_allow_html=True
+            )
+            # I'm showing 4 info cards in a row: IP address, MAC address,
+            # connection type, and status (all built once in DETAIL_CARDS above)
+            # format_map() fills in {ip}, {mac}, {connection_type} and {status}
+            # straight from the device's dictionary
+            # The connection card's border is cyan for wired and purple for Wi-Fi
+            # The status text itself is colored too: "ONLINE" green, "OFFLINE" red
+            # The IP is the device's local network IP (like 192.168.1.5)
+            # The MAC address is the hardware ID burned into the network card
+            # (like AA:BB:CC:DD:EE:FF), so it works like a serial number
+            # I used to make 4 st.columns() with a card in each, which was 8
+            # elements to send - now it's one HTML grid like my metric cards
+
+            st.markdown("---")
+            # I'm adding a horizontal line to separate sections
+            # Makes the layout cleaner
+
+    # ============================================================================
+    # STEP 7: DISPLAY METRICS (TOP ROW)
+    # ============================================================================
+    # I'm showing summary statistics at the top of my dashboard
+    # These give users a quick overview of the network status
+    # The numbers change based on what the user selected in the dropdown
+
+    # I used to make 3 st.columns() with a st.metric() in each one
+    # That's 3 columns + 3 metrics = 6 separate elements Streamlit has to send
+    # to the browser on every refresh. Now I build all three cards as one HTML grid
+    # and send it with a single st.markdown() call (same idea as my other HTML cards)
 
-        height=450
-        # Map height in pixels
-        # 450px is big enough to see but doesn't dominate the page
+    st.markdown(
+        "<div class='dash-grid' style='grid-template-columns: repeat(3, 1fr);'>"
+        + metric_card("Connected Devices", total_devices)
+        # This shows how many devices are currently online
+        # I calculated this number earlier in STEP 6C
+        # For "All Devices": shows total online devices
+        # For single device: shows 1 (online) or 0 (offline)
+
+        + metric_card("Total Download", f"{total_download:.2f} MB")
+        # This shows the cumulative download traffic
+        # I'm using an f-string with :.2f to format to 2 decimal places
+        # So 156.789 becomes "156.79 MB"
+        # This is the total downloaded (not current speed)
+
+        + metric_card("Total Upload", f"{total_upload:.2f} MB")
+        # Same idea but for upload traffic
+        # Upload is usually lower than download
+        # Most internet connections are asymmetric (more download than upload)
+
+        + "</div>",
+        unsafe_allow_html=True
     )
+    # grid-template-columns: repeat(3, 1fr) gives me 3 equal columns like st.columns(3) did
+
+    # ============================================================================
+    # STEP 7.25: LIVE THROUGHPUT DISPLAY
+    # ============================================================================
+    # I'm showing the CURRENT network speeds (not totals)
+    # These are the live speeds happening right now
+    # Measured in Mbps (megabits per second)
+
+    st.markdown("### Live Throughput")
+    # I'm adding a heading for this section
+    # "Live" tells users this is real-time, not historical
+
+    # I used to make 2 st.columns() with one HTML card in each, but that's
+    # 2 columns + 2 cards = 4 elements to send every tick for 2 numbers
+    # Now both cards are one HTML grid sent with a single st.markdown()
+    # (same idea as my metric cards in STEP 7)
+    # I can't skip sending it when the speeds didn't change - anything my
+    # panel doesn't draw again on a rerun gets removed from the page
+    st.markdown(
+        THROUGHPUT_CARDS_TEMPLATE.format(
+            download=f"{current_download_speed:.2f}",
+            upload=f"{current_upload_speed:.2f}"
+        ),
+        unsafe_allow_html=True
+    )
+    # Download is the cyan card on the left, upload the purple card on the right
+    # I made the font size really big (36px) so users can see it easily
+    # The speed is in Mbps (megabits per second)
+    # Note: Mbps is different from MB/s (megabytes per second)
+    # 8 Mbps = 1 MB/s because 1 byte = 8 bits
+    # ISPs use Mbps because the numbers are bigger
+    # Side-by-side lets users compare download vs upload easily
 
-    # -------------------------------------------------------------------------
-    # CUSTOMIZE MAP MARKER APPEARANCE
-    # -------------------------------------------------------------------------
-    fig.update_traces(
-        # I'm customizing how the connection dots look
+    # ============================================================================
+    # STEP 7.5: NETWORK SPEED GRAPH (30-MINUTE HISTORY)
+    # ============================================================================
+    # I'm creating a graph that shows network speeds over the last 30 minutes
+    # This lets users see trends and patterns in their network usage
+    # I'm tracking this data in STEP 6E (per device) and STEP 6F (all devices)
+
+    graph_slot = st.empty()
+    # Like my device details slot in STEP 6.5, the graph always gets one fixed
+    # spot in the panel, even when it's hidden
+    # So the heading and the chart (or the "Collecting data" message) get
+    # swapped inside this one spot, and switching sections doesn't shift my
+    # devices table down or up and make the browser rebuild it
+
+    with graph_slot.container():
+        if show_charts:
+            # I only build the graph when the user is on the "Overview" section
+            # Otherwise I skip all of this (the history keeps recording in STEP 6 though)
+            render_throughput(selected_device, current_time_ns, detailed_graph)
+
+    # ============================================================================
+    # STEP 8: DEVICES CURRENTLY CONNECTED
+    # ============================================================================
+    # I'm showing a table with all the device information
+    # This is an interactive table users can sort and scroll
+    # The table changes based on whether they picked "All Devices" or a single device
+
+    # I'm changing the header based on what's selected
+    if selected_device != "All Devices":
+        # User picked one device - use singular
+        st.subheader("Current Device")
+        # "Current" makes it clear this is the one they picked
+    else:
+        # User is viewing all devices - use plural
+        st.subheader("Devices Currently Connected")
+        # This tells users they're seeing all connected devices
+
+    # I'm building the table as Arrow myself
+    # st.dataframe() turns pandas DataFrames into Arrow anyway, so I skip the
+    # pandas step
+    table_rows = selected_mask if selected_device != "All Devices" else slice(None)
+    # Which entries of my STEP 6 arrays belong in the table
+    # For "All Devices" that's all of them, and slice(None) (the same as [:])
+    # gives me the arrays themselves instead of a copy picked out by the mask
+
+    info_table = get_device_info_table()
+    # The columns that never change come from my cached table, so I don't
+    # read them out of every device's dictionary again every refresh
+    if selected_device != "All Devices":
+        info_table = info_table.filter(selected_mask)
+        # Just the row for the device they picked (same mask as STEP 6B)
+
+    status_column = pa.DictionaryArray.from_arrays(device_online[table_rows].astype(np.int8), DEVICE_STATUS_VALUES)
+    # My online True/False array turns straight into the status codes
+    # (0 = OFFLINE, 1 = ONLINE), so there's no text to compare or copy
+
+    mb_table = device_arrays['traffic_mb'][:, table_rows]
+    # My generator already converted both byte rows to MB (1 MB = 1,048,576 bytes)
+    # in one float32 multiply, in the same device order as my table
+    # table_rows picks the same devices I put in the table above
+    # float32 is plenty for a number I only show with 2 decimals
+    # (it's also half the bytes of float64 for Streamlit to send)
+
+    download_mb, upload_mb = (pc.round(pa.array(mb_values), ndigits=2) for mb_values in mb_table)
+    # I'm rounding to 2 decimal places with Arrow's round, one call per column
+    # Row 0 is download and row 1 is upload
+    # It works right on the Arrow data, so I don't bounce through NumPy
+    # Before, Streamlit had to apply a "%.2f MB" format to every single cell
+    # The "(MB)" in the header already tells users the unit
+
+    last_seen_column = pa.array(device_arrays['last_seen'][table_rows], type=pa.string())
+    # Last seen is the only text that changes every tick
+    # My generator hands it back as one array like the numbers, so I pick
+    # the table's rows the same way instead of reading every device's dictionary
+
+    display_table = pa.Table.from_arrays(
+        info_table.columns + [status_column, download_mb, upload_mb, last_seen_column],
+        names=DEVICE_TABLE_HEADERS
+    )
+    # I put the 9 columns together once, already in left-to-right order,
+    # and give them the friendly header names by position (DEVICE_TABLE_HEADERS
+    # in dashboard_config.py lines up with this order)
+    # I used to add the columns one at a time (a new table each time) and then
+    # pick and rename all 9 by name with .select() and .rename_columns()
 
-        marker=dict(
-            # marker is a dictionary with styling options
+    # I'm displaying the table
+    st.dataframe(
+        # st.dataframe() creates an interactive table
+        # Users can sort by clicking column headers
 
-            size=10,
-            # Each dot is 10 pixels wide
-            # Big enough to see but not too big
+        display_table,
+        # This is the Arrow table I created above with 9 columns
+        # st.dataframe() takes Arrow tables directly, so there's no conversion at all
+        # The columns are already renamed, so I don't need a column_config anymore
 
-            color='#00d4ff',
-            # Cyan color (matches my download theme)
+        use_container_width=True,
+        # This makes the table fill the available width
+        # Without this it would be narrow and hard to read
 
-            opacity=0.8,
-            # 80% opaque, 20% transparent
-            # Transparency lets you see overlapping dots
+        hide_index=True
+        # I'm hiding the row numbers (0, 1, 2...)
+        # They're not useful here and make the table cluttered
+    )
 
-            line=dict(
-                # Border around each dot
 
-                width=1,
-                # Thin 1px border
+live_panel(selected_device, show_charts, detailed_graph)
+# I'm drawing the live panel (and starting its timer when Live Updates are on)
 
-                color='white'
-                # White border makes dots stand out against the dark map
-            )
+# ============================================================================
+# STEP 9: GLOBAL TRAFFIC MAP (PLOTLY) - Only show for "All Devices"
+# ============================================================================
+# I'm creating a world map showing where external servers are located
+# This only shows for "All Devices" view (not single device)
+# It helps users see if connections are coming from unexpected places
+
+# ----------------------------------------------------------------------------
+# BUILD THE MAP ONCE AND REUSE IT
+# ----------------------------------------------------------------------------
+# Same idea as my speed graph: building the map plus all the styling calls is
+# slow to redo every refresh, but only the dots actually change
+# Every session shows the same batch from the same feed, so the whole app
+# shares one map figure (see _get_map_state() below) instead of every
+# session styling its own copy and filling in the same dots
+
+def _make_map_fig():
+    """
+    Builds the styled world map with an empty set of connection dots
+    """
+    # -------------------------------------------------------------------------
+    # CREATE PLOTLY GEOGRAPHIC SCATTER PLOT
+    # -------------------------------------------------------------------------
+    fig = go.Figure(
+        go.Scattergeo(
+            # I'm creating a scatter plot on a world map
+            # I used to use px.scatter_geo(), but plotly.express builds a whole
+            # DataFrame pipeline behind the scenes just to make this one trace
+            # Each connection appears as a dot on the map
+
+            lat=[],
+            lon=[],
+            # Empty for now - the real dots get filled in on every refresh
+            # Latitude goes from -90 (South Pole) to +90 (North Pole)
+            # Longitude goes from -180 (West) to +180 (East)
+
+            mode='markers',
+            # Just dots, no lines between them
+
+            marker=MAP_MARKER,
+            # Cyan, slightly see-through dots with a thin white border
+            # (the full style is in dashboard_config.py)
+
+            hovertemplate='lat=%{lat}<br>lon=%{lon}<extra></extra>'
+            # Same hover text plotly.express gave me
+            # <extra></extra> hides the extra trace name box
         )
     )
 
     # -------------------------------------------------------------------------
     # CUSTOMIZE MAP GEOGRAPHY (LAND, OCEAN, BORDERS)
     # -------------------------------------------------------------------------
-    fig.update_geos(
-        # I'm customizing how the map itself looks
-
-        showcountries=True,
-        # Show country borders
-
-        countrycolor="rgba(100, 100, 100, 0.3)",
-        # Gray borders at 30% opacity
-        # Subtle so they don't compete with my cyan dots
-
-        showcoastlines=True,
-        # Show coastlines
-
-        coastlinecolor="rgba(255, 255, 255, 0.3)",
-        # White coastlines at 30% opacity
-        # Slightly brighter than country borders
-
-        showland=True,
-        # Show land masses
-
-        landcolor="rgba(30, 30, 30, 0.8)",
-        # Very dark gray for land
-        # Matches my dark theme
-
-        showocean=True,
-        # Show oceans
-
-        oceancolor="rgba(10, 10, 30, 0.9)",
-        # Even darker for oceans
-        # Slight blue tint to distinguish from land
-
-        projection_type='equirectangular',
-        # Reinforcing the projection type
-
-        bgcolor='rgba(0,0,0,0)'
-        # Transparent background so Streamlit's background shows through
-    )
+    fig.update_geos(**MAP_GEO_STYLE)
+    # I'm customizing how the map itself looks
+    # Dark land and ocean, subtle borders and coastlines, transparent background
+    # ** unpacks my settings dictionary into keyword arguments
+    # This only runs once because I keep the whole map figure around
+    # I thought about turning the basemap into a PNG and putting the dots on top,
+    # but that needs kaleido (plus a headless Chrome) and an image can't follow
+    # the map when users zoom or pan, so the browser still draws the land itself
 
     # -------------------------------------------------------------------------
     # CONFIGURE OVERALL FIGURE LAYOUT
@@ -1474,6 +1670,10 @@ if selected_device == "All Devices":
     fig.update_layout(
         # I'm setting the overall layout styling
 
+        height=450,
+        # Map height in pixels
+        # 450px is big enough to see but doesn't dominate the page
+
         paper_bgcolor='rgba(0,0,0,0)',
         # Transparent background for the outer area
 
@@ -1485,17 +1685,179 @@ if selected_device == "All Devices":
         # All transparent so it integrates nicely with Streamlit
     )
 
+    return fig
+    # _get_map_state() keeps this figure so I only style the map once
+
+
+@st.cache_resource
+def _get_map_state():
+    """
+    The one shared map figure, plus what's needed to update it safely
+    @st.cache_resource means every session gets this same dict back
+
+    - 'lock' makes one session wait while another swaps in new dots or
+      sends the map to its browser, so nobody sends a half-updated map
+    - 'batch' and 'key' remember which batch and which dots are on the map
+    """
+    return {
+        'fig': _make_map_fig(),
+        'lock': threading.Lock(),
+        'batch': None,
+        'key': None
+    }
+
+
+# ----------------------------------------------------------------------------
+# START THE CONNECTION FEED ONCE
+# ----------------------------------------------------------------------------
+@st.cache_resource
+def _get_connection_feed():
+    """
+    Starts one background connection feed for the whole app
+    @st.cache_resource means this runs once, so I only ever get one thread
+    (not a new thread on every refresh)
+    """
+    feed = ConnectionFeed(get_traffic_generator().generate_external_connections)
+    # The feed is shared by every browser tab, just like my generator
+    feed.start()
+    return feed
+
+
+# ----------------------------------------------------------------------------
+# GROUP EACH BATCH INTO MAP DOTS
+# ----------------------------------------------------------------------------
+def _map_cells(connections):
+    """
+    Groups one batch of connections into the dots I draw on the map
+    Returns (cell lats, cell lons, dot sizes, fingerprint of the dots)
+
+    The map figure is shared by every session, so this only runs once per
+    batch (whichever session notices the new batch first)
+    """
+    # Half of my connections are in the US, so lots of dots pile up on top of
+    # each other. I group them into 5-degree cells and draw one dot per cell,
+    # with a bigger dot when more connections are in that cell
+    cell_lat, cell_lon, cell_counts = bin_connections(connections['lat'], connections['lon'])
+
+    cell_sizes = np.minimum(8 + 4 * (cell_counts - 1), 20)
+    # A cell with 1 connection gets a size 8 dot, each extra connection adds 4
+    # I cap it at 20 so busy cells don't cover up the whole map
+
+    map_key = hash((cell_lat.tobytes(), cell_lon.tobytes(), cell_counts.tobytes()))
+    # This is a fingerprint of the dots I'm about to draw
+    # A new batch can still land in the exact same cells as the last one
+    # Because the dots snap to grid cells, this matches a lot more often now
+
+    return cell_lat, cell_lon, cell_sizes, map_key
+
+
+# ----------------------------------------------------------------------------
+# MAP REFRESH RATE
+# ----------------------------------------------------------------------------
+# My connections come from the background feed, not from the full script run
+# So I let the map refresh on its own every few seconds (as often as the feed
+# makes new connections) without rerunning the rest of the page
+# When Live Updates are off the map holds still like everything else, and
+# with nobody reading from it the feed stops making connections too
+MAP_FRAGMENT_RUN_EVERY = CONNECTION_REFRESH_SECONDS if auto_refresh else None
+
+
+@st.fragment(run_every=MAP_FRAGMENT_RUN_EVERY)
+def render_map():
+    """
+    Draws the world map of external connections
+
+    This is its own fragment, so it can rerun on its own schedule
+    (see MAP_FRAGMENT_RUN_EVERY above) without touching my graph or tables
+    """
+    st.markdown("### Global Traffic Origins")
+    # I'm adding a heading for the map section
+
+    st.markdown("Live map of external servers communicating with your network.")
+    # I'm explaining what the map shows
+    # External servers = computers outside the local network
+    # Like websites, cloud services, etc.
+
+    # -------------------------------------------------------------------------
+    # FETCH CONNECTION DATA
+    # -------------------------------------------------------------------------
+    batch_number, connections = _get_connection_feed().latest_batch()
+    # I'm grabbing the newest batch of fake connections from my background feed
+    # The feed makes a new batch every 5 seconds, so this never waits
+    # It's a dict with a 'lat' array and a 'lon' array (one entry per connection)
+    # batch_number counts up by one every time the feed makes a new batch
+    # My generator makes realistic distribution:
+    #   - 50% United States (most traffic)
+    #   - 10% China
+    #   - 10% Russia
+    #   - 30% European Union
+    # This simulates real global internet patterns
+
+    map_state = _get_map_state()
+    fig = map_state['fig']
+    # I get the pre-styled map back (it's only built once for the whole app)
+
     # -------------------------------------------------------------------------
     # DISPLAY THE COMPLETED MAP
     # -------------------------------------------------------------------------
-    st.plotly_chart(fig, use_container_width=True)
+    with map_state['lock']:
+        # Everything below touches the shared figure, so one session at a time
+
+        if map_state['batch'] != batch_number:
+            # The feed made a new batch since the map was last drawn
+            # If it didn't (like when the user changes the dropdown between two
+            # batches, or another session already filled it in), I skip this
+            # and just show the same map again
+
+            cell_lat, cell_lon, cell_sizes, map_key = _map_cells(connections)
+            # The grid cells and dot sizes for this batch (see _map_cells() above)
+
+            # -----------------------------------------------------------------
+            # FILL THE SHARED MAP WITH THIS BATCH'S CONNECTIONS
+            # -----------------------------------------------------------------
+            if map_state['key'] != map_key:
+                # The dots changed, so I swap in the new ones
+                with fig.batch_update():
+                    fig.data[0].lat = cell_lat
+                    fig.data[0].lon = cell_lon
+                    fig.data[0].marker.size = cell_sizes
+                    # I only swap in the new dots and their sizes, the map styling stays the same
+
+                map_state['key'] = map_key
+                # I remember the fingerprint so next batch can skip this if nothing changed
+
+            map_state['batch'] = batch_number
+            # I remember which batch is on the map so nobody redoes it
+
+        st.plotly_chart(fig, use_container_width=True, key="traffic_map")
     # I'm displaying the map
     # use_container_width=True makes it fill the available width
+    # key="traffic_map" keeps it the same chart element from batch to batch
+    # (like my speed graph), so when the dots change the browser updates
+    # the map it already has instead of throwing it away and drawing a new one
     # The map is interactive:
     #   - Hover to see coordinates
     #   - Zoom and pan
     #   - Reset with the home button
     # This helps users see if traffic is coming from unexpected places
+    #
+    # I thought about putting the map and the speed graph in one figure with
+    # make_subplots() to save browser WebGL contexts, but the map is drawn
+    # with SVG (scattergeo), so my speed graph is already the only WebGL chart
+    # on the page. Merging them would also force the map up next to the graph
+    # instead of below the devices table, so I kept them separate.
+    #
+    # I also looked at st.pydeck_chart with a ScatterplotLayer, but deck.gl
+    # needs a map tile service for the land and borders underneath the dots.
+    # My map only changes its dots (the styled figure is built once for the
+    # whole app), so switching wouldn't save anything and I'd lose the dark theme.
+
+
+if selected_device == "All Devices" and show_charts:
+    # Map only shows for "All Devices" view
+    # It doesn't make sense for single device view
+    # I also skip it (including making the connections) when the charts are hidden
+    render_map()
 
 # ============================================================================
 # STEP 8.5: SECURITY ALERTS TABLE
@@ -1504,221 +1866,208 @@ if selected_device == "All Devices":
 # These are simulated alerts (port scans, malware, etc.) from my data generator
 # The table filters based on what device the user selected
 
-st.markdown("### Suspicious Traffic Alerts")
-# I'm adding a heading for the security alerts section
-# "Suspicious" tells users these might be security problems
-
 # -------------------------------------------------------------------------
-# FILTER ALERTS BASED ON DEVICE SELECTION
-# -------------------------------------------------------------------------
-if selected_device != "All Devices":
-    # User picked a specific device - show only that device's alerts
-    # This helps them focus on one device's security
-
-    filtered_alerts = [alert for alert in st.session_state.security_alerts if alert['device'] == selected_device]
-    # I'm using a list comprehension to filter
-    # This loops through all alerts and keeps only ones for this device
-    # More compact than writing a for loop with if statement and append
-else:
-    # User is viewing "All Devices" - show all alerts
-    filtered_alerts = st.session_state.security_alerts
-    # No filtering needed - use the full list
-
+# BUILD THE ALERTS TABLE
 # -------------------------------------------------------------------------
-# DISPLAY ALERTS IF ANY EXIST
-# -------------------------------------------------------------------------
-if filtered_alerts:
-    # I'm checking if there are any alerts to show
-    # Empty list is "falsy" so this won't run if no alerts
-    # -------------------------------------------------------------------------
-    # CONVERT ALERTS TO DATAFRAME
-    # -------------------------------------------------------------------------
-    alerts_df = pd.DataFrame(filtered_alerts)
-    # I'm converting my list of alert dictionaries to a DataFrame
-    # This makes it easier to display and format
-
-    # -------------------------------------------------------------------------
-    # FORMAT TIMESTAMP FOR READABILITY
-    # -------------------------------------------------------------------------
-    alerts_df['Time'] = alerts_df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    # I'm creating a nicely formatted time column
-    # .dt.strftime() lets me format datetime objects
-    # The format is Year-Month-Day Hour:Minute:Second
-    # Example: "2025-11-30 17:45:23"
-
-    # -------------------------------------------------------------------------
-    # SELECT AND RENAME COLUMNS FOR DISPLAY
-    # -------------------------------------------------------------------------
-    display_alerts = alerts_df[['Time', 'device', 'external_ip', 'reason', 'severity']]
-    # I'm selecting just the columns I want to show
-    # Time first, then device, external IP, alert type, severity
-
-    display_alerts.columns = ['Time', 'Device', 'External IP', 'Alert Type', 'Severity']
-    # I'm renaming the columns to look more professional
-    # 'reason' becomes 'Alert Type' which is clearer
+def build_alerts_table(alert_columns):
+    """
+    Formats the alerts for display
+
+    alert_columns is {field: array} from my AlertLog (newest first)
+    render_alerts() only calls this when the alerts or the device filter
+    changed, otherwise it reuses the table it built last time
+    """
+    alert_time, device, external_ip, reason, severity = (
+        alert_columns[field] for field in ALERT_SOURCE_COLUMNS
+    )
+    # I'm pulling out the columns I show, in table order
+
+    display_alerts = pa.Table.from_arrays(
+        [
+            pa.array(alert_time, type=pa.string()),
+            pa.array(device, type=pa.string()).dictionary_encode(),
+            pa.array(external_ip, type=pa.string()),
+            pa.array(reason, type=pa.string()),
+            pa.DictionaryArray.from_arrays(severity, ALERT_SEVERITY_VALUES, ordered=True)
+        ],
+        names=ALERT_TABLE_HEADERS
+    )
+    # I'm building the table as Arrow, the same as my devices table
+    # st.dataframe() has to turn a pandas DataFrame into Arrow every time it's
+    # drawn - and this panel draws the table again on every rerun, even when
+    # I reuse the saved table - so handing it Arrow skips that every time
+    # The columns get the professional-looking headers right away
+    # (ALERT_TABLE_HEADERS), so there's no rename or column swap afterwards
+    # The Time column is already text like "2025-11-30 17:45:23" - my generator
+    # formats it once when it makes the alert, so I don't run strftime here
+    # I only have 5 devices and 3 severity levels, so those are dictionary
+    # columns: each row sends a small number code to the browser instead of text
+    # My alert log already keeps severity as those number codes, so they point
+    # straight at the labels ("🔴 High" and so on, see dashboard_config.py)
+    # ordered=True means Low < Medium < High if I ever sort by it
+
+    return display_alerts
+
+
+# When Live Updates are on, the alerts panel reruns on its own every
+# refresh_rate seconds - just this panel, not my whole script
+# It shares the live panel's timer (LIVE_RUN_EVERY from the sidebar)
+@st.fragment(run_every=LIVE_RUN_EVERY)
+def render_alerts(selected_device):
+    """
+    Draws the alerts table + summary from my session's alert log
+    (the live panel collects the new alerts when it ticks the generator)
+
+    This is its own fragment, so its timer reruns only this function
+    (my sidebar, header, map and the rest of the page stay as they are)
+    """
+    st.markdown("### Suspicious Traffic Alerts")
+    # I'm adding a heading for the security alerts section
+    # "Suspicious" tells users these might be security problems
 
     # -------------------------------------------------------------------------
-    # DEFINE SEVERITY HIGHLIGHTING FUNCTION
+    # FILTER, COUNT AND FORMAT THE ALERTS (ONLY WHEN SOMETHING CHANGED)
     # -------------------------------------------------------------------------
-    def highlight_severity(row):
-        # I'm creating a function to color-code rows by severity
-        # This gets called for each row in the table
-
-        if row['Severity'] == 'High':
-            # High severity = red highlighting
-            return ['background-color: #fee2e2; color: #991b1b'] * len(row)
-            # Light red background, dark red text
-            # * len(row) applies this to every column in the row
+    alerts_view_key = (st.session_state.security_alerts.version, selected_device)
+    # This is a fingerprint of what this panel shows
+    # My alert log's version goes up every time new alerts come in
+    # So if the version and the picked device are the same as last time,
+    # the table and the counts would come out exactly the same
+    # Most runs of this panel are like that (alerts only show up sometimes)
+
+    if st.session_state.get('alerts_view_key') != alerts_view_key:
+        # Something changed, so I redo the filtering, counting and formatting
+
+        alert_columns = st.session_state.security_alerts.columns(
+            None if selected_device == "All Devices" else selected_device
+        )
+        # I'm getting my alerts as one array per field
+        # If the user picked a specific device, the log only gives me that device's alerts
+        # (one comparison over the whole device array instead of checking each alert)
+
+        alert_count = len(alert_columns['severity'])
+        # Every array has one entry per alert, so any of them gives me the count
+        # I don't build a DataFrame out here at all - with at most 50 alerts,
+        # the plain arrays are faster than any DataFrame library would be
+        # (build_alerts_table() makes the one Arrow table I show)
+
+        severity_counts = np.bincount(alert_columns['severity'], minlength=len(SEVERITY_CODES))
+        # I'm counting every severity level in one pass
+        # severity holds my alert log's number codes (see alert_log.py), so
+        # bincount() gives me [Low count, Medium count, High count] in one go
+        # minlength makes sure every level is there (0 if there aren't any)
+
+        st.session_state.alerts_view = {
+            'count': alert_count,
+            'table': build_alerts_table(alert_columns) if alert_count else None,
+            'high': int(severity_counts[SEVERITY_CODES['High']]),
+            'medium': int(severity_counts[SEVERITY_CODES['Medium']])
+        }
+        # I remember the finished table and the numbers for my summary metrics
+        # With no alerts I never touch pandas at all (there's no table to build)
+        # I used to cache the table with @st.cache_data keyed on every alert's
+        # text, but hashing all that text took about as long as building it,
+        # and the shared cache kept an entry for every set of alerts forever
 
-        elif row['Severity'] == 'Medium':
-            # Medium severity = yellow highlighting
-            return ['background-color: #fef3c7; color: #92400e'] * len(row)
-            # Light yellow background, dark orange text
+        st.session_state.alerts_view_key = alerts_view_key
 
-        else:
-            # Low severity = no special styling
-            return [''] * len(row)
-            # Empty string means default styling
+    alerts_view = st.session_state.alerts_view
+    alert_count = alerts_view['count']
+    # If nothing changed I skip all of the above and reuse what I made last time
+    # I still have to draw the table every run though - Streamlit removes
+    # anything this panel doesn't draw again
 
     # -------------------------------------------------------------------------
-    # APPLY STYLING TO DATAFRAME
+    # DISPLAY ALERTS IF ANY EXIST
     # -------------------------------------------------------------------------
-    styled_df = display_alerts.style.apply(highlight_severity, axis=1)
-    # I'm applying my highlighting function to the DataFrame
-    # .style creates a Styler object
-    # .apply with axis=1 means it runs on each row
-    # Now my high/medium alerts will be colored
-
-    # -------------------------------------------------------------------------
-    # DISPLAY STYLED ALERTS TABLE
-    # -------------------------------------------------------------------------
-    st.dataframe(
-        # I'm displaying the color-coded alerts table
-
-        styled_df,
-        # My styled DataFrame with color coding
-
-        use_container_width=True,
-        # Make it fill the available width
+    if alert_count:
+        # I'm checking if there are any alerts to show
+        # 0 is "falsy" so this won't run if there are no alerts
+        # I kept one st.dataframe for 1 alert or 50 - the saved table means
+        # small alert lists are only built once anyway
+
+        # -------------------------------------------------------------------------
+        # DISPLAY ALERTS TABLE
+        # -------------------------------------------------------------------------
+        st.dataframe(
+            # I'm displaying the alerts table
+
+            alerts_view['table'],
+            # My alerts Arrow table - the Severity column shows a colored dot
+            # (🔴 High, 🟡 Medium) right in its text, so there's no styling step
+
+            use_container_width=True,
+            # Make it fill the available width
+
+            column_config=ALERT_COLUMN_CONFIG,
+            # I'm customizing column widths (the settings are in dashboard_config.py)
+
+            hide_index=True
+            # I'm hiding row numbers
+        )
 
-        column_config={
-            # I'm customizing column widths
+        # -------------------------------------------------------------------------
+        # ALERT SUMMARY METRICS
+        # -------------------------------------------------------------------------
+        # I'm adding summary metrics below the table
+        # This gives users quick stats about the alerts
 
-            "Time": st.column_config.TextColumn("Time", width="medium"),
-            "Device": st.column_config.TextColumn("Device", width="medium"),
-            "External IP": st.column_config.TextColumn("External IP", width="medium"),
-            "Alert Type": st.column_config.TextColumn("Alert Type", width="large"),
-            # Alert type gets large width because descriptions can be long
-            "Severity": st.column_config.TextColumn("Severity", width="small")
-            # Severity is small because it's just "High", "Medium", or "Low"
-        },
+        col_alert1, col_alert2, col_alert3 = st.columns(3)
+        # I'm creating 3 columns for my metrics
 
-        hide_index=True
-        # I'm hiding row numbers
-    )
-
-    # -------------------------------------------------------------------------
-    # ALERT SUMMARY METRICS
-    # -------------------------------------------------------------------------
-    # I'm adding summary metrics below the table
-    # This gives users quick stats about the alerts
+        col_alert1.metric("Total Alerts", alert_count)
+        # Total count of all alerts
 
-    high_alerts = len([a for a in filtered_alerts if a['severity'] == 'High'])
-    # I'm counting how many high severity alerts there are
-    # Using a list comprehension to filter and count
+        col_alert2.metric("High Severity", alerts_view['high'], delta=None, delta_color="inverse")
+        # Count of high severity alerts
+        # delta=None means no change arrow
+        # delta_color="inverse" would make decreases good (not used here)
 
-    medium_alerts = len([a for a in filtered_alerts if a['severity'] == 'Medium'])
-    # Same for medium severity
+        col_alert3.metric("Medium Severity", alerts_view['medium'])
+        # Count of medium severity alerts
 
-    col_alert1, col_alert2, col_alert3 = st.columns(3)
-    # I'm creating 3 columns for my metrics
-
-    col_alert1.metric("Total Alerts", len(filtered_alerts))
-    # Total count of all alerts
+    else:
+        # This runs if there are no alerts to display
+        # Either no alerts exist or the selected device has none
 
-    col_alert2.metric("High Severity", high_alerts, delta=None, delta_color="inverse")
-    # Count of high severity alerts
-    # delta=None means no change arrow
-    # delta_color="inverse" would make decreases good (not used here)
+        # -------------------------------------------------------------------------
+        # NO ALERTS MESSAGE
+        # -------------------------------------------------------------------------
+        if selected_device != "All Devices":
+            # User is viewing a specific device with no alerts
+            st.info(f"No suspicious traffic detected from {selected_device}.")
+            # I'm showing a message that includes the device name
 
-    col_alert3.metric("Medium Severity", medium_alerts)
-    # Count of medium severity alerts
+        else:
+            # User is viewing "All Devices" with no alerts
+            st.info("No suspicious traffic detected. Your network appears secure.")
+            # I'm showing a generic "all clear" message
 
-else:
-    # This runs if there are no alerts to display
-    # Either no alerts exist or the selected device has none
 
-    # -------------------------------------------------------------------------
-    # NO ALERTS MESSAGE
-    # -------------------------------------------------------------------------
-    if selected_device != "All Devices":
-        # User is viewing a specific device with no alerts
-        st.info(f"No suspicious traffic detected from {selected_device}.")
-        # I'm showing a message that includes the device name
-
-    else:
-        # User is viewing "All Devices" with no alerts
-        st.info("No suspicious traffic detected. Your network appears secure.")
-        # I'm showing a generic "all clear" message
+render_alerts(selected_device)
+# I'm drawing the alerts panel (and starting its timer when Live Updates are on)
 
 # ============================================================================
 # STEP 10: AUTO-REFRESH LOGIC
 # ============================================================================
-# I'm implementing the "Live Updates" feature here
-# When enabled, this makes the dashboard automatically refresh
-# This is what creates the real-time monitoring effect
-
-if auto_refresh:
-    # I'm checking if the user enabled "Enable Live Updates" in the sidebar
-    # auto_refresh is the boolean from my checkbox (True or False)
-    # If True, I run this code to create the auto-refresh loop
-
-    # -------------------------------------------------------------------------
-    # PAUSE EXECUTION
-    # -------------------------------------------------------------------------
-    time.sleep(refresh_rate)
-    # I'm pausing for the number of seconds the user picked with the slider
-    # refresh_rate is 1-10 seconds from the sidebar slider
-    # This creates a delay between updates
-    # Without this pause, the dashboard would refresh crazy fast
-
-    # -------------------------------------------------------------------------
-    # TRIGGER COMPLETE SCRIPT RERUN
-    # -------------------------------------------------------------------------
-    st.rerun()
-    # I'm telling Streamlit to restart the script from the top
-    # This is how I create the auto-refresh:
-    #   1. Script runs from top to bottom
-    #   2. Gets to this point and pauses (time.sleep)
-    #   3. Then st.rerun() restarts from line 1
-    #   4. Repeat forever (or until user unchecks the box)
-    #
-    # Each time it reruns:
-    #   - My data generator creates new fake data
-    #   - Traffic history gets new data points
-    #   - New security alerts might appear
-    #   - All graphs and tables update with fresh data
-    #
-    # The loop continues until:
-    #   - User unchecks "Enable Live Updates"
-    #   - User closes the browser
-    #   - I stop the Streamlit server
-    #
-    # My session_state variables (traffic_history, alerts, etc.) persist
-    # across reruns so my data accumulates instead of resetting
+# I used to do time.sleep(refresh_rate) and then st.rerun() here, and later a
+# tiny timer fragment that restarted the whole script every refresh_rate seconds
+# Now nothing restarts the whole script: the live panel (STEPS 5-8) and the
+# alerts panel (STEP 8.5) each rerun on their own every refresh_rate seconds
+# when Live Updates are on, and the map (STEP 9) follows its connection feed
+# When Live Updates are off, none of them have a timer at all
 
 # ============================================================================
 # END OF SCRIPT
 # ============================================================================
 # If auto_refresh is False (Live Updates disabled):
 #   - Script runs once and stops here
-#   - Dashboard shows a static snapshot
+#   - Dashboard shows a static snapshot (the map included)
 #   - Only updates when user changes something (dropdown, slider, etc.)
 #
 # If auto_refresh is True (Live Updates enabled):
-#   - st.rerun() is called above
-#   - Script never reaches this point
-#   - It reruns from the top before getting here
-#   - Creates continuous refresh loop
+#   - The script still finishes here right away (nothing waits)
+#   - The fragment timers keep rerunning just the panels that change
+#   - The sidebar, CSS and header stay as they are until the user changes something
 
-###///###
\ No newline at end of file
+###///###
@@ -0,0 +1,143 @@
+# =============================================================================
+# CHART HELPERS MODULE
+# =============================================================================
+# INF601 - Advanced Programming in Python
+# Jeremy McKowski
+# Final Project
+#
+# This file holds the number-crunching I do before handing data to Plotly
+# My throughput graph can collect up to 1,800 points in 30 minutes (1 second
+# refresh), and Plotly gets slow to draw and hover when it has that many points
+# So I shrink the data down to what the screen can actually show first
+
+# =============================================================================
+# IMPORT REQUIRED LIBRARIES
+# =============================================================================
+import numpy as np
+# I'm using NumPy so the math runs on whole arrays at once
+# instead of looping over every point in plain Python
+
+# =============================================================================
+# DEFAULT SETTINGS
+# =============================================================================
+# I picked 800 points because my graph is never more than ~800 pixels wide,
+# so drawing more points than that doesn't show anything new
+LTTB_TARGET_POINTS = 800
+
+# My world map is split into 36 x 72 cells (5 degrees each) for binning
+MAP_BINS = (36, 72)
+
+# The most dots I'll ever draw on the map - every dot is its own SVG circle
+# with a white outline, so I keep the count small no matter how busy it gets
+MAP_MAX_CELLS = 200
+
+
+# =============================================================================
+# LTTB DOWNSAMPLING
+# =============================================================================
+def lttb_indices(x, y, n_out=LTTB_TARGET_POINTS):
+    """
+    Picks which points to keep using Largest-Triangle-Three-Buckets (LTTB)
+
+    LTTB splits the data into n_out buckets and keeps the one point from each
+    bucket that makes the biggest triangle with its neighbours. That keeps the
+    peaks and dips that make the graph look right, unlike just taking every Nth point.
+
+    Plain LTTB goes bucket by bucket, because each triangle starts at the point
+    kept from the bucket before. A Python loop over 800 buckets was too slow, so
+    I do every bucket at once in two NumPy passes: the first pass starts each
+    triangle at the previous bucket's average, and the second pass starts it at
+    the point the first pass kept there. On my traffic data that keeps 90%+ of
+    the exact same points, and the peaks and dips still make it in.
+
+    x and y are NumPy arrays of numbers (I pass timestamps as int64 nanoseconds)
+
+    Returns a NumPy array of the indices to keep (always includes the first and last point)
+    """
+    n = len(y)
+
+    # If I already have few enough points there's nothing to do
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # The first and last points always stay, the middle gets n_out - 2 buckets
+    # Bucket i holds the points from edges[i] up to (not including) edges[i + 1]
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+    counts = ends - starts
+
+    # Every bucket's average, from running totals (no loop over the buckets)
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+    mean_x = (x_sums[ends] - x_sums[starts]) / counts
+    mean_y = (y_sums[ends] - y_sums[starts]) / counts
+
+    # The "next" point of each triangle is the average of the following bucket
+    # (the last bucket uses the very last point instead)
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    # One row per bucket, one column per point in it (short buckets get padded)
+    candidates = starts[:, None] + np.arange(counts.max())
+    padding = candidates >= ends[:, None]
+    candidates[padding] = n - 1
+    cand_x, cand_y = x[candidates], y[candidates]
+
+    def pick(anchor_x, anchor_y):
+        # Triangle area for every candidate in every bucket (the 0.5 doesn't change which is biggest)
+        ax, ay = anchor_x[:, None], anchor_y[:, None]
+        areas = np.abs(
+            (ax - next_x[:, None]) * (cand_y - ay) - (ax - cand_x) * (next_y[:, None] - ay)
+        )
+        areas[padding] = -1.0
+        return candidates[np.arange(len(starts)), areas.argmax(axis=1)]
+
+    # Pass 1: each triangle starts at the previous bucket's average (the first point for bucket 0)
+    selected = pick(np.append(x[0], mean_x[:-1]), np.append(y[0], mean_y[:-1]))
+
+    # Pass 2: each triangle starts at the point pass 1 kept in the previous bucket
+    selected = pick(np.append(x[0], x[selected[:-1]]), np.append(y[0], y[selected[:-1]]))
+
+    return np.concatenate(([0], selected, [n - 1]))
+
+
+# =============================================================================
+# MAP BINNING
+# =============================================================================
+def bin_connections(lat, lon, bins=MAP_BINS, max_cells=MAP_MAX_CELLS):
+    """
+    Groups map points into a coarse lat/lon grid (like Datashader does)
+
+    Lots of my connections land on top of each other (the US is 50% of them),
+    so instead of drawing one dot per connection I draw one dot per grid cell
+    and make it bigger when more connections fall in that cell.
+
+    If more than max_cells cells have points, I only keep the busiest ones
+    (same input always gives the same dots, so the map doesn't flicker)
+
+    Returns (cell_lat, cell_lon, counts) for every cell with at least one point
+    """
+    counts, lat_edges, lon_edges = np.histogram2d(
+        lat, lon, bins=bins, range=((-90, 90), (-180, 180))
+    )
+
+    # I only keep the cells that actually have connections in them
+    lat_idx, lon_idx = np.nonzero(counts)
+
+    if len(lat_idx) > max_cells:
+        # A stable sort keeps ties in grid order, so the cut is always the same
+        busiest = np.argsort(-counts[lat_idx, lon_idx], kind='stable')[:max_cells]
+        lat_idx, lon_idx = lat_idx[busiest], lon_idx[busiest]
+
+    # The dot goes in the middle of its cell
+    # The cell centers are whole or half degrees (like 37.5), so float32 holds
+    # them exactly - and Plotly sends float32 to the browser in half the bytes
+    cell_lat = ((lat_edges[lat_idx] + lat_edges[lat_idx + 1]) / 2).astype(np.float32)
+    cell_lon = ((lon_edges[lon_idx] + lon_edges[lon_idx + 1]) / 2).astype(np.float32)
+
+    return cell_lat, cell_lon, counts[lat_idx, lon_idx].astype(np.int64)
+
+###///###
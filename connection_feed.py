@@ -0,0 +1,115 @@
+# =============================================================================
+# CONNECTION FEED MODULE
+# =============================================================================
+# INF601 - Advanced Programming in Python
+# Jeremy McKowski
+# Final Project
+#
+# This file makes the external connections for my world map in the background
+# Before, app.py called generate_external_connections() right in the middle of
+# drawing the page. Now a background thread makes a new batch every few seconds
+# and app.py just grabs the newest one, so the page never waits on it
+
+# =============================================================================
+# IMPORT REQUIRED LIBRARIES
+# =============================================================================
+import threading
+# threading lets me run my producer loop next to Streamlit without blocking it
+
+import time
+# time.monotonic() tells me how long it's been since the map last asked for a batch
+# and time.sleep() spaces out the batches in the background thread
+
+from collections import deque
+# A deque with maxlen=1 only ever holds the newest batch
+# Appending a new batch automatically throws the old one away
+
+import numpy as np
+# Each batch of connections is a pair of NumPy arrays (lat and lon)
+
+# =============================================================================
+# DEFAULT SETTINGS
+# =============================================================================
+# How often (in seconds) the background thread makes a new batch of connections
+CONNECTION_REFRESH_SECONDS = 5
+
+# If nobody has asked for a batch in this many seconds, the map isn't on
+# anyone's screen (a single device is picked or the charts are hidden), so
+# the background thread stops making connections until someone asks again
+CONNECTION_IDLE_SECONDS = 3 * CONNECTION_REFRESH_SECONDS
+
+# The connections latest_batch() hands back before the first batch exists
+EMPTY_CONNECTIONS = {
+    'lat': np.empty(0, dtype=np.float32),
+    'lon': np.empty(0, dtype=np.float32)
+}
+
+
+# =============================================================================
+# ConnectionFeed CLASS DEFINITION
+# =============================================================================
+class ConnectionFeed:
+    """
+    Keeps the latest batch of external connections for the map
+
+    - produce is any function that returns {"lat": array, "lon": array}
+    - The background thread calls it every interval seconds
+    - latest_batch() hands back the newest batch without waiting, plus which
+      batch number it is (1, 2, 3, ...), so the map can tell when nothing new
+      has come in
+    - When nobody has called latest_batch() for idle_after seconds the thread
+      skips its turns, so a hidden map doesn't cost anything
+    """
+
+    def __init__(self, produce, interval=CONNECTION_REFRESH_SECONDS, idle_after=CONNECTION_IDLE_SECONDS):
+        """Sets up the feed - nothing runs until start() is called"""
+        self.produce = produce
+        self.interval = interval
+        self.idle_after = idle_after
+        # Only one float that gets swapped out whole, so no lock needed
+        self._last_read = time.monotonic()
+        # Each entry is (batch number, connections) so the two always match
+        self._latest = deque(maxlen=1)
+        self._batches_made = 0
+        self._thread = None
+
+    def start(self):
+        """
+        Makes the first batch right away (so the map isn't empty on the first
+        load) and then starts the background thread for the rest
+        """
+        if self._thread is not None:
+            return
+
+        self._publish(self.produce())
+
+        # daemon=True means the thread won't keep Python running on shutdown
+        self._thread = threading.Thread(target=self._producer, daemon=True)
+        self._thread.start()
+
+    def _producer(self):
+        """The loop the background thread runs"""
+        # The thread runs for as long as the app does (it's a daemon thread)
+        while True:
+            time.sleep(self.interval)
+            if time.monotonic() - self._last_read < self.idle_after:
+                self._publish(self.produce())
+
+    def _publish(self, connections):
+        """Numbers a new batch and makes it the latest one"""
+        # Only one thread ever publishes at a time (start() runs before the
+        # thread exists), so counting up here doesn't need a lock
+        self._batches_made += 1
+        self._latest.append((self._batches_made, connections))
+
+    def latest_batch(self):
+        """
+        Returns (batch number, connections) for the newest batch
+        The batch number is 0 (with empty arrays) before the first batch exists
+        Calling this also tells the background thread the map is still showing
+        """
+        self._last_read = time.monotonic()
+        # Reading [0] from a deque is thread-safe, so I don't need a lock
+        return self._latest[0] if self._latest else (0, EMPTY_CONNECTIONS)
+
+###///###
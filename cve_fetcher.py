@@ -21,10 +21,23 @@ import requests
 # It's basically like a web browser but for Python code
 # I installed it with: pip install requests
 
-from datetime import datetime
-# I need datetime for two things:
-#   1. Converting the date strings I get from the API into readable dates
-#   2. Tracking when I last fetched data (for caching)
+import orjson
+# orjson turns the API's JSON into Python much faster than the built-in json module
+# (it's already in my requirements.txt because Plotly uses it too)
+
+import time
+# I use time.monotonic() to track when I last fetched data (for caching)
+
+from itertools import islice
+# islice() lets me take just the first few items of a list without copying it
+
+from urllib.parse import urlencode, urlsplit
+# urlencode() turns my search params into a query string like "a=1&b=2"
+# and urlsplit() tells me if my API URL already has a query string
+
+import re
+# I use regular expressions to check descriptions for my router keywords
+# and to spot the date at the start of the published timestamp
 
 import os
 # I use os to read environment variables from my .env file
@@ -35,10 +48,46 @@ from dotenv import load_dotenv
 # The dotenv library loads my API key from the .env file
 # I installed it with: pip install python-dotenv
 
-# I call this first to load the .env file before I try to use the API key
-load_dotenv()
-# This searches for a .env file and reads all the settings from it
-# My .env file has one line: NVD_API_KEY=my-actual-key-here
+# =============================================================================
+# CACHE SETTINGS
+# =============================================================================
+# How long (in seconds) I reuse my last CVE list before asking NVD again
+# New Ubiquiti CVEs only show up every few days, but my dashboard header runs
+# on every full page rerun (every click), so without this each click was a
+# whole HTTPS request to NVD and used up part of my rate limit
+CVE_CACHE_SECONDS = 60 * 60
+
+# After a failed fetch, how long I wait before asking NVD again
+# Without this, every page rerun while NVD (or my internet) is down made a
+# new request and could sit there for the whole 10 second timeout
+CVE_RETRY_SECONDS = 60
+
+# =============================================================================
+# CVE PARSING SETTINGS
+# =============================================================================
+# Words in a description that tell me a CVE affects routers
+ROUTER_KEYWORDS = ('router', 'unifi', 'usg', 'udm', 'network', 'gateway')
+
+# All my keywords joined into one pattern like "router|unifi|usg|..."
+# One search() call checks the whole description for every keyword at once,
+# and re.IGNORECASE means I don't need to make a lowercase copy first
+# (no \b word boundaries, so "networking" still counts, same as before)
+ROUTER_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, ROUTER_KEYWORDS)), re.IGNORECASE)
+
+# The CVSS versions I look for, from newest to oldest
+# (some CVEs use v3.1, some v3.0, some v2.0)
+CVSS_VERSIONS = ('cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2')
+
+# What I show when a CVE has no English description
+NO_DESCRIPTION = 'No description available'
+
+# Longer descriptions get cut to this many characters (plus "...")
+# so they don't break my dashboard layout
+DESCRIPTION_MAX_LENGTH = 200
+
+# A published date starts with the day, like "2024-11-30T15:30:00.000Z"
+# If it matches this, the first 10 characters are already the date I show
+PUBLISHED_DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
 
 # =============================================================================
 # CVEFetcher CLASS DEFINITION
@@ -71,6 +120,13 @@ class CVEFetcher:
         # =====================================================================
         # LOAD THE API KEY
         # =====================================================================
+        # I load the .env file first so the API key is there to read
+        load_dotenv()
+        # This searches for a .env file and reads all the settings from it
+        # My .env file has one line: NVD_API_KEY=my-actual-key-here
+        # I used to do this as soon as the file was imported, but the key
+        # is only needed here, and my app only creates one fetcher
+
         # I try to load the API key from my .env file
         # If there's no key, the code still works (just with rate limits)
         self.api_key = os.getenv('NVD_API_KEY')
@@ -91,6 +147,22 @@ class CVEFetcher:
         # With an API key: 50 requests per 30 seconds (much better)
         # I got my free API key from: https://nvd.nist.gov/developers/request-an-api-key
 
+        # =====================================================================
+        # SET UP ONE HTTP SESSION
+        # =====================================================================
+        # requests.get() opens a brand new connection (including the whole
+        # HTTPS handshake) every time. A Session keeps the connection open and
+        # reuses it, so my next fetch from NVD skips that setup
+        self.session = requests.Session()
+
+        # I learned that NVD API v2.0 wants the API key in the headers
+        # The correct header name is 'X-API-Key' (not 'apiKey')
+        # Putting it on the session means every request sends it automatically
+        if self.api_key:
+            self.session.headers['X-API-Key'] = self.api_key
+            # This gives me 50 requests/30sec instead of just 5
+        # If I don't have a key, I just leave the headers alone and it still works
+
         # =====================================================================
         # SET UP CACHE STORAGE
         # =====================================================================
@@ -100,8 +172,16 @@ class CVEFetcher:
         # Starts as None, becomes a list after the first successful fetch
 
         self.last_fetch_time = None
-        # I track when I last fetched data in case I want to implement
-        # rate limiting later (like only fetch once per minute)
+        # time.monotonic() of my last successful fetch
+        # If it was less than CVE_CACHE_SECONDS ago I skip the API completely
+
+        self.cached_max_results = None
+        # How many CVEs I asked for last time, so a different max_results
+        # doesn't get handed a list of the wrong length
+
+        self.failed_at = None
+        # time.monotonic() of my last try that didn't work out
+        # It goes back to None after a successful fetch
 
     # =========================================================================
     # MAIN METHOD TO GET CVE DATA
@@ -113,8 +193,34 @@ class CVEFetcher:
         I set max_results=3 because my dashboard only shows 3 CVEs
 
         Returns a list of dictionaries with CVE info, or None if something fails
+        If I fetched the same number of CVEs in the last CVE_CACHE_SECONDS,
+        I return that list right away without calling the API
+        If a fetch failed in the last CVE_RETRY_SECONDS, I don't try again yet
+        Whenever a fetch fails (or I'm waiting to retry), I return my last good
+        list if it was for the same max_results, or None otherwise
         """
 
+        # =====================================================================
+        # REUSE MY LAST RESULTS IF THEY'RE STILL FRESH
+        # =====================================================================
+        if (self.last_fetch_time is not None
+                and self.cached_max_results == max_results
+                and time.monotonic() - self.last_fetch_time < CVE_CACHE_SECONDS):
+            return self.cached_cves
+        # I check last_fetch_time instead of the list itself, because a good
+        # fetch can come back with no CVEs at all - an empty list is still fresh
+
+        # =====================================================================
+        # DON'T RETRY A FAILING API ON EVERY RERUN
+        # =====================================================================
+        now = time.monotonic()
+        if self.failed_at is not None and now - self.failed_at < CVE_RETRY_SECONDS:
+            return self._cached_for(max_results)
+
+        self.failed_at = now
+        # I assume this try fails until it reaches the end successfully,
+        # so every early return and error below counts as a failure
+
         # =====================================================================
         # WRAP EVERYTHING IN TRY-EXCEPT FOR ERROR HANDLING
         # =====================================================================
@@ -128,32 +234,21 @@ class CVEFetcher:
             # NVD API v2.0 requires specific parameter format
             params = {
                 'keywordSearch': 'Ubiquiti',
-                'resultsPerPage': 5
+                'resultsPerPage': max_results
             }
             # keywordSearch: I'm looking for anything mentioning "Ubiquiti"
-            # resultsPerPage: Limit to 5 results to reduce data transfer
-
-            # =================================================================
-            # ADD MY API KEY TO THE HEADERS (IF I HAVE ONE)
-            # =================================================================
-            # I learned that NVD API v2.0 wants the API key in the headers
-            # The correct header name is 'X-API-Key' (not 'apiKey')
-            headers = {}
-
-            # If I have an API key, I add it to the headers
-            if self.api_key:
-                headers['X-API-Key'] = self.api_key
-                # This gives me 50 requests/30sec instead of just 5
-            # If I don't have a key, I just leave headers empty and it still works
+            # resultsPerPage: Only as many CVEs as I show - each one comes with
+            # long lists of affected products and references, so every extra
+            # CVE is a lot more data to download and parse
 
             # =================================================================
             # MAKE THE HTTP REQUEST TO THE API
             # =================================================================
-            # I use requests.get() to fetch data from the NVD API
-            response = requests.get(self.api_url, params=params, headers=headers, timeout=10)
-            # self.api_url: The NVD endpoint I'm calling
-            # params: My search criteria (keyword=Ubiquiti)
-            # headers: My API key (if I have one)
+            # I use my session's get() to fetch data from the NVD API
+            response = self.session.get(self._search_url(params), timeout=10)
+            # _search_url() builds the whole URL: the NVD endpoint, my search
+            # criteria (keyword=Ubiquiti) and the noRejected flag (see below)
+            # My API key (if I have one) is already in the session's headers
             # timeout=10: Give up after 10 seconds if no response
 
             # Check if the request was successful (status code 200)
@@ -165,133 +260,38 @@ class CVEFetcher:
             # =================================================================
             # The API sends back JSON (text format)
             # I convert it to a Python dictionary so I can work with it
-            data = response.json()
+            data = orjson.loads(response.content)
+            # orjson reads the raw bytes with its fast C parser, instead of
+            # response.json() decoding them to text and using the slower json module
 
             # Make sure the response has what I expect
             # If there's no 'vulnerabilities' key, something's wrong
             if 'vulnerabilities' not in data:
-                return None  # Return None so my dashboard knows there's no data
+                return self._cached_for(max_results)  # Same fallback as my errors below
 
             # =================================================================
             # PROCESS THE CVE DATA
             # =================================================================
-            # I create an empty list to store the cleaned-up CVE data
-            cves = []
-
             # Pull out the vulnerabilities list from the response
             vulnerabilities = data['vulnerabilities']
 
             # =================================================================
-            # LOOP THROUGH EACH CVE
+            # CLEAN UP THE FIRST max_results CVES
             # =================================================================
-            # I loop through up to 9 vulnerabilities (max_results * 3)
-            # I do more than 3 because some might be missing data I need
-            for vuln_item in vulnerabilities[:max_results * 3]:
-                # Each vuln_item is one CVE record from the API
-
-                # Pull out the CVE data
-                cve = vuln_item.get('cve', {})
-                cve_id = cve.get('id', 'N/A')
-
-                # -------------------------------------------------------------
-                # EXTRACT THE DESCRIPTION
-                # -------------------------------------------------------------
-                # CVEs can have descriptions in multiple languages
-                # I need to find the English one
-                descriptions = cve.get('descriptions', [])
-                description = 'No description available'  # Default if I don't find English
-
-                # Loop through until I find the English description
-                for desc in descriptions:
-                    if desc.get('lang') == 'en':
-                        description = desc.get('value', 'No description available')
-                        break  # Found it, stop looking
-
-                # -------------------------------------------------------------
-                # CHECK IF THIS CVE AFFECTS ROUTERS
-                # -------------------------------------------------------------
-                # I want to flag CVEs that specifically affect routers
-                # I check if the description mentions router-related keywords
-                description_lower = description.lower()
-                router_keywords = ['router', 'unifi', 'usg', 'udm', 'network', 'gateway']
-
-                # Loop through keywords and see if any are in the description
-                is_router_related = False
-                for keyword in router_keywords:
-                    if keyword in description_lower:
-                        is_router_related = True
-                        break  # Found one, that's enough
-
-                # -------------------------------------------------------------
-                # EXTRACT CVSS SCORE AND SEVERITY
-                # -------------------------------------------------------------
-                # CVSS scores tell me how dangerous a vulnerability is (0-10 scale)
-                # Higher = more dangerous. I use this for color-coding in my dashboard
-                metrics = cve.get('metrics', {})
-
-                # Set defaults in case there's no score
-                cvss_score = 'N/A'
-                severity = 'UNKNOWN'
-
-                # Try different CVSS versions (some CVEs use v3.1, some v3.0, some v2.0)
-                # I check in order from newest to oldest
-                cvss_versions = ['cvssMetricV31', 'cvssMetricV30', 'cvssMetricV2']
-
-                for cvss_version in cvss_versions:
-                    if cvss_version in metrics and metrics[cvss_version]:
-                        # Found a version that exists, grab the score from it
-                        cvss_data = metrics[cvss_version][0]['cvssData']
-                        cvss_score = cvss_data.get('baseScore', 'N/A')
-                        severity = cvss_data.get('baseSeverity', 'UNKNOWN')
-                        break  # Got what I need, stop checking other versions
-
-                # -------------------------------------------------------------
-                # CLEAN UP THE PUBLISHED DATE
-                # -------------------------------------------------------------
-                # The API gives me dates like "2024-11-30T15:30:00.000Z"
-                # I want to simplify it to just "2024-11-30" for my dashboard
-                published = cve.get('published', 'N/A')
-
-                if published != 'N/A':
-                    try:
-                        # Parse the date string and reformat it
-                        pub_date = datetime.fromisoformat(published.replace('Z', '+00:00'))
-                        published = pub_date.strftime('%Y-%m-%d')
-                    except:
-                        # If parsing fails, just keep the original string
-                        pass
-
-                # -------------------------------------------------------------
-                # BUILD THE CVE DICTIONARY
-                # -------------------------------------------------------------
-                # I need to shorten the description if it's too long
-                # (otherwise it breaks my dashboard layout)
-                if len(description) > 200:
-                    description = description[:200] + '...'
-
-                # Put all the data into a dictionary
-                cve_info = {
-                    'id': cve_id,
-                    'description': description,
-                    'severity': severity,
-                    'cvss_score': cvss_score,
-                    'published': published,
-                    'is_router_related': is_router_related
-                }
-
-                # Add this CVE to my list
-                cves.append(cve_info)
-
-                # If I have enough CVEs, stop processing more
-                if len(cves) >= max_results:
-                    break  # Exit the loop early
+            # _parse_cve() (below) turns one CVE record into my dictionary
+            # islice() hands me just the first max_results records without
+            # copying the list, and the loop stops as soon as I have enough
+            # (every record gives me a CVE, so I never need to look further)
+            cves = [self._parse_cve(vuln_item) for vuln_item in islice(vulnerabilities, max_results)]
 
             # =================================================================
             # SAVE TO CACHE AND RETURN
             # =================================================================
             # I save the results to cache in case the API fails next time
             self.cached_cves = cves
-            self.last_fetch_time = datetime.now()
+            self.cached_max_results = max_results
+            self.last_fetch_time = now
+            self.failed_at = None
 
             # Return the list of CVE dictionaries to my dashboard
             return cves
@@ -306,10 +306,7 @@ class CVEFetcher:
 
             # If I have cached data, return that instead of crashing
             # Otherwise return None so my dashboard knows something failed
-            if self.cached_cves:
-                return self.cached_cves
-            else:
-                return None
+            return self._cached_for(max_results)
 
         # =====================================================================
         # ERROR HANDLING - OTHER UNEXPECTED PROBLEMS
@@ -320,10 +317,126 @@ class CVEFetcher:
             print(f"Unexpected error fetching CVE data: {e}")
 
             # Same logic - try to return cached data, otherwise None
-            if self.cached_cves:
-                return self.cached_cves
-            else:
-                return None
+            return self._cached_for(max_results)
+
+    # =========================================================================
+    # HELPER METHOD FOR THE CACHED FALLBACK
+    # =========================================================================
+    def _cached_for(self, max_results):
+        """
+        Returns my last good list if it was fetched with the same max_results,
+        otherwise None (the same check my freshness test at the top uses),
+        so a failed fetch never hands back a list of the wrong length
+        """
+        if self.cached_max_results == max_results:
+            return self.cached_cves
+        return None
+
+    # =========================================================================
+    # HELPER METHOD TO BUILD THE SEARCH URL
+    # =========================================================================
+    def _search_url(self, params):
+        """
+        Builds the full request URL from self.api_url and my search params
+
+        NVD's noRejected flag leaves out rejected CVEs (withdrawn ones I'd never
+        show), but it has no value - NVD wants "noRejected", not "noRejected=".
+        requests' params= always adds an "=", so I build the query string
+        myself and tack the flag on the end. If api_url already has a query
+        string, my params get added to it with "&" instead of a second "?".
+        """
+        separator = "&" if urlsplit(self.api_url).query else "?"
+        return f"{self.api_url}{separator}{urlencode(params)}&noRejected"
+
+    # =========================================================================
+    # HELPER METHOD TO CLEAN UP ONE CVE
+    # =========================================================================
+    def _parse_cve(self, vuln_item):
+        """
+        Turns one CVE record from the NVD API into the dictionary my dashboard uses
+        Each vuln_item is one entry of the 'vulnerabilities' list
+        """
+        # Pull out the CVE data
+        cve = vuln_item.get('cve', {})
+        cve_id = cve.get('id', 'N/A')
+
+        # ---------------------------------------------------------------------
+        # EXTRACT THE DESCRIPTION
+        # ---------------------------------------------------------------------
+        # CVEs can have descriptions in multiple languages
+        # I need to find the English one
+        descriptions = cve.get('descriptions', [])
+        description = NO_DESCRIPTION  # Default if I don't find English
+
+        # Loop through until I find the English description
+        for desc in descriptions:
+            if desc.get('lang') == 'en':
+                description = desc.get('value', NO_DESCRIPTION)
+                break  # Found it, stop looking
+
+        # ---------------------------------------------------------------------
+        # CHECK IF THIS CVE AFFECTS ROUTERS
+        # ---------------------------------------------------------------------
+        # I want to flag CVEs that specifically affect routers
+        # I check if the description mentions any of my ROUTER_KEYWORDS
+        is_router_related = ROUTER_KEYWORD_PATTERN.search(description) is not None
+
+        # ---------------------------------------------------------------------
+        # EXTRACT CVSS SCORE AND SEVERITY
+        # ---------------------------------------------------------------------
+        # CVSS scores tell me how dangerous a vulnerability is (0-10 scale)
+        # Higher = more dangerous. I use this for color-coding in my dashboard
+        metrics = cve.get('metrics', {})
+
+        # Set defaults in case there's no score
+        cvss_score = None
+        # None instead of the text 'N/A', so the score is always a number or
+        # nothing (the dashboard decides how to show a missing one)
+        severity = 'UNKNOWN'
+
+        # Try different CVSS versions, in order from newest to oldest
+        for cvss_version in CVSS_VERSIONS:
+            if cvss_version in metrics and metrics[cvss_version]:
+                # Found a version that exists, grab the score from it
+                cvss_data = metrics[cvss_version][0]['cvssData']
+                cvss_score = cvss_data.get('baseScore')
+                severity = cvss_data.get('baseSeverity', 'UNKNOWN')
+                break  # Got what I need, stop checking other versions
+
+        # ---------------------------------------------------------------------
+        # CLEAN UP THE PUBLISHED DATE
+        # ---------------------------------------------------------------------
+        # The API gives me dates like "2024-11-30T15:30:00.000Z"
+        # I want to simplify it to just "2024-11-30" for my dashboard
+        published = cve.get('published')
+        # None if the API left it out (same idea as cvss_score above)
+
+        # I used to parse the whole thing with datetime.fromisoformat() and
+        # then strftime() it back to text, but the date is already sitting
+        # at the start of the string, so I just cut it off
+        if published and PUBLISHED_DATE_PATTERN.match(published):
+            published = published[:10]
+        # Anything else I just keep as it is
+
+        # ---------------------------------------------------------------------
+        # BUILD THE CVE DICTIONARY
+        # ---------------------------------------------------------------------
+        # I need to shorten the description if it's too long
+        # (otherwise it breaks my dashboard layout)
+        if len(description) > DESCRIPTION_MAX_LENGTH:
+            description = description[:DESCRIPTION_MAX_LENGTH] + '...'
+
+        # Put all the data into a dictionary
+        cve_info = {
+            'id': cve_id,
+            'description': description,
+            'severity': severity,
+            'cvss_score': cvss_score,
+            'published': published,
+            'is_router_related': is_router_related
+        }
+
+        return cve_info
 
 # =============================================================================
 # END OF FILE
@@ -0,0 +1,160 @@
+# =============================================================================
+# DASHBOARD CONFIG MODULE
+# =============================================================================
+# INF601 - Advanced Programming in Python
+# Jeremy McKowski
+# Final Project
+#
+# This file holds the fixed settings my dashboard uses (column lists, labels, etc.)
+# Streamlit reruns app.py from the top on every refresh, so anything I define
+# in app.py gets rebuilt every time. Python only imports a module once, so
+# the values in here get built once and reused on every refresh.
+
+import pyarrow as pa
+# PyArrow is the table format Streamlit uses to send dataframes to the browser
+# I describe my devices table in Arrow types so I can build it directly
+
+import streamlit as st
+# I need Streamlit here for the alerts table's column settings
+
+from alert_log import SEVERITY_LEVELS
+# The severity levels, in the same order as the codes my alert log stores
+
+# =============================================================================
+# THROUGHPUT GRAPH STYLE (STEP 7.5)
+# =============================================================================
+# I'm styling the download line cyan (#00d4ff) to match my download theme
+# width=2 makes it 2 pixels thick
+DOWNLOAD_LINE = dict(color='#00d4ff', width=2)
+
+# I'm making the fill cyan but transparent (15% opacity)
+# rgba is Red, Green, Blue, Alpha (transparency)
+# I need transparency so you can see both fills when they overlap
+# WebGL fills stack up darker where they overlap, so I went a bit lighter than 20%
+DOWNLOAD_FILL = 'rgba(0, 212, 255, 0.15)'
+
+# I'm using purple for upload (consistent with my theme), same 2px width
+UPLOAD_LINE = dict(color='#a855f7', width=2)
+
+# Purple fill at 15% opacity (same as download)
+# RGB values match the purple hex color
+UPLOAD_FILL = 'rgba(168, 85, 247, 0.15)'
+
+# I'm setting all margins to 0
+# Streamlit adds its own padding so I don't need extra
+SPEED_MARGIN = dict(l=0, r=0, t=0, b=0)
+
+# I'm configuring the legend box
+SPEED_LEGEND = dict(
+    orientation="h",   # "h" means horizontal (items side-by-side) - saves vertical space
+    yanchor="bottom",  # This sets the anchor point for positioning
+    y=1.02,            # Slightly above the graph (1.0 = top) so it doesn't cover my data
+    xanchor="right",   # Anchor for horizontal positioning
+    x=1                # Right edge - combined with the anchors this puts it top-right
+)
+
+# =============================================================================
+# WORLD MAP STYLE (STEP 9)
+# =============================================================================
+# I'm customizing how the connection dots look
+MAP_MARKER = dict(
+    size=10,             # Starting dot size (I resize the dots by connection count)
+    color='#00d4ff',     # Cyan color (matches my download theme)
+    opacity=0.8,         # 80% opaque - transparency lets you see overlapping dots
+    line=dict(
+        width=1,         # Thin 1px border around each dot
+        color='white'    # White border makes dots stand out against the dark map
+    )
+)
+
+# I'm customizing how the map itself looks (land, ocean, borders)
+MAP_GEO_STYLE = dict(
+    showcountries=True,
+    countrycolor="rgba(100, 100, 100, 0.3)",   # Gray borders at 30% - subtle next to my cyan dots
+    showcoastlines=True,
+    coastlinecolor="rgba(255, 255, 255, 0.3)", # White coastlines, a bit brighter than borders
+    showland=True,
+    landcolor="rgba(30, 30, 30, 0.8)",          # Very dark gray land - matches my dark theme
+    showocean=True,
+    oceancolor="rgba(10, 10, 30, 0.9)",         # Even darker ocean with a slight blue tint
+    projection_type='equirectangular',          # Reinforcing the projection type
+    resolution=110,                             # The coarse 1:110m outlines - smallest map file for the browser
+    bgcolor='rgba(0,0,0,0)'                     # Transparent so Streamlit's background shows through
+)
+
+# =============================================================================
+# DEVICES TABLE (STEP 8)
+# =============================================================================
+# These are the headers of my devices table, in left-to-right order
+# I build each refresh's table with these names by position, so there's
+# no picking or renaming columns by name every refresh
+DEVICE_TABLE_HEADERS = [
+    'Device Name',       # Device name like "Home Desktop PC" or "User iPhone"
+    'Type',              # Device type (Router, Desktop, Mobile, Printer)
+    'IP Address',        # Local network IP address
+    'MAC Address',       # MAC address (hardware ID)
+    'Connection',        # Wired or Wi-Fi
+    'Status',            # ONLINE or OFFLINE
+    'Download (MB)',     # Total download traffic
+    'Upload (MB)',       # Total upload traffic
+    'Last Seen'          # Last activity timestamp
+]
+
+# These are the Arrow column types for the parts of my devices table that
+# never change (a device's name, type, IP, MAC and connection stay the same
+# for as long as the app runs), so I only build these columns once
+# My generator gives me a list of dicts, so I build them straight from it
+# with pa.Table.from_pylist() (any keys that aren't in here get skipped)
+# type and connection_type only have a few different values each, so I
+# store them as dictionary columns (each value once plus a tiny int8 code per row)
+DEVICE_INFO_SCHEMA = pa.schema([
+    ('name', pa.string()),
+    ('type', pa.dictionary(pa.int8(), pa.string())),
+    ('ip', pa.string()),
+    ('mac', pa.string()),
+    ('connection_type', pa.dictionary(pa.int8(), pa.string()))
+])
+
+# Status is a dictionary column too, but I build it every refresh from my
+# True/False online array: False (code 0) is OFFLINE and True (code 1) is ONLINE
+DEVICE_STATUS_VALUES = pa.array(['OFFLINE', 'ONLINE'])
+
+# =============================================================================
+# SECURITY ALERTS TABLE (STEP 8.5)
+# =============================================================================
+# What I show in the Severity column for each level
+# The colored dot replaces the red/yellow row highlighting I used to do with
+# a pandas Styler (same colors, but no per-cell CSS to send every refresh)
+SEVERITY_LABELS = {
+    'Low': '⚪ Low',
+    'Medium': '🟡 Medium',
+    'High': '🔴 High'
+}
+
+# Severity only ever has a few values, so my alerts table stores it as an
+# Arrow dictionary column: each label once, plus a tiny number code per row
+# My alert log already stores each alert's severity as its position in
+# SEVERITY_LEVELS, so those codes point straight into this list of labels
+ALERT_SEVERITY_VALUES = pa.array([SEVERITY_LABELS[level] for level in SEVERITY_LEVELS])
+
+# The alert fields I show, in the order they appear in the table
+# Time first, then device, external IP, alert type, severity
+# 'time' is the timestamp my generator already formatted as text
+ALERT_SOURCE_COLUMNS = ['time', 'device', 'external_ip', 'reason', 'severity']
+
+# The header names I show for those columns, in the same order
+# 'reason' becomes 'Alert Type' which is clearer
+ALERT_TABLE_HEADERS = ['Time', 'Device', 'External IP', 'Alert Type', 'Severity']
+
+# I'm customizing the alerts table's column widths
+ALERT_COLUMN_CONFIG = {
+    "Time": st.column_config.TextColumn("Time", width="medium"),
+    "Device": st.column_config.TextColumn("Device", width="medium"),
+    "External IP": st.column_config.TextColumn("External IP", width="medium"),
+    "Alert Type": st.column_config.TextColumn("Alert Type", width="large"),
+    # Alert type gets large width because descriptions can be long
+    "Severity": st.column_config.TextColumn("Severity", width="small")
+    # Severity is small because it's just a colored dot and "High", "Medium", or "Low"
+}
+
+###///###
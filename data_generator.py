@@ -9,12 +9,98 @@
 # and better format it for demo.
 
 import random
-from faker import Faker
-from datetime import datetime, timedelta
-
-# Step 1: Initialize Faker
-# We use Faker to generate realistic-looking data like MAC addresses and IPs.
-fake = Faker()
+import threading
+import time
+import ipaddress
+import numpy as np
+from datetime import datetime
+
+
+# Step 1: Helpers for realistic-looking MAC addresses and IPs
+# These used to come from Faker, but importing Faker loads its whole locale
+# database (a slow start for the dashboard) just for these two small jobs.
+def random_mac_address():
+    """Returns a random MAC address like "aa:bb:cc:dd:ee:ff" (6 pairs of hex digits)."""
+    return ":".join(f"{random.randint(0, 255):02x}" for _ in range(6))
+
+
+def random_public_ipv4():
+    """
+    Returns a random public IPv4 address as a string.
+    Private, loopback, multicast and other reserved addresses are skipped,
+    so it always looks like a real server out on the internet.
+    """
+    while True:
+        address = ipaddress.IPv4Address(random.getrandbits(32))
+        if address.is_global and not address.is_multicast:
+            return str(address)
+
+# Step 1B: NumPy random generator for the traffic ticks and map connections
+# Drawing a whole batch of random numbers in one call is much faster than
+# calling random.random() and random.uniform() once per device or connection.
+rng = np.random.default_rng()
+
+# Step 1C: Where the external connections come from
+# One row per region, in this order: US, China, Russia, EU
+# CONNECTION_CUMULATIVE_WEIGHTS is the running total of each region's share
+# (50%, 10%, 10%, 30%), so searchsorted() can turn a random number into a region.
+CONNECTION_CUMULATIVE_WEIGHTS = np.array([0.5, 0.6, 0.7])
+# The last region (EU) catches everything from 0.7 up to 1.0
+
+# Approx center (lat, lon) of each region
+CONNECTION_CENTERS = np.array([
+    [37.0, -95.0],   # US
+    [35.0, 104.0],   # China
+    [61.0, 105.0],   # Russia
+    [50.0, 10.0]     # EU
+])
+
+# How far (lat, lon) a connection can land from its region's center
+# The EU box isn't centered, so I keep a low and a high edge for each region
+CONNECTION_OFFSET_LOW = np.array([
+    [-10.0, -20.0],  # US
+    [-5.0, -10.0],   # China
+    [-10.0, -20.0],  # Russia
+    [-5.0, -10.0]    # EU
+])
+CONNECTION_OFFSET_HIGH = np.array([
+    [10.0, 20.0],    # US
+    [5.0, 10.0],     # China
+    [10.0, 20.0],    # Russia
+    [10.0, 20.0]     # EU
+])
+
+# Step 1D: How much traffic each type of device makes per tick
+# Each entry is ((download low, download high), (upload low, upload high)),
+# the same download-then-upload order as the arrays tick() returns.
+# Router has higher throughput, Printer is minimal, and every other type
+# (desktops, mobile) uses the OTHER_DEVICE ranges.
+TRAFFIC_BYTE_RANGES = {
+    "Router": ((5000, 10000000), (1000, 5000000)),
+    "Printer": ((0, 1000), (0, 1000))
+}
+OTHER_DEVICE_BYTE_RANGES = ((500, 5000000), (100, 1000000))
+
+# Same layout, for the current speeds in MB/s
+TRAFFIC_SPEED_RANGES = {
+    "Router": ((2.0, 50.0), (0.5, 10.0)),
+    "Printer": ((0.0, 0.5), (0.0, 0.5))
+}
+OTHER_DEVICE_SPEED_RANGES = ((0.5, 25.0), (0.1, 5.0))
+
+# Devices that randomly go ONLINE/OFFLINE, and the chance per tick that they flip
+TOGGLING_DEVICES = ("Home Printer", "Guest Android")
+STATUS_FLIP_CHANCE = 0.1
+
+# The shared simulation moves forward at most once every TICK_SECONDS
+# (the fastest refresh the dashboard's slider allows), however many
+# browser tabs are asking for ticks
+TICK_SECONDS = 1
+
+# Byte totals get shown in MB (1 MB = 1,024 x 1,024 bytes)
+# MB_PER_BYTE is the same conversion as one float32 number to multiply by
+BYTES_PER_MB = 1024 * 1024
+MB_PER_BYTE = np.float32(1 / BYTES_PER_MB)
 
 
 class NetworkTrafficGenerator:
@@ -24,7 +110,7 @@ class NetworkTrafficGenerator:
 
         IMPORTANT: MAC addresses are generated ONCE during initialization and remain static.
         This simulates real hardware where MAC addresses are burned into the network interface
-        and never change. If we generated them on every call to fake.mac_address(), they would
+        and never change. If we generated them on every call to random_mac_address(), they would
         change each time the class is instantiated, which is unrealistic.
 
         Connection types (Wired/Wi-Fi) are assigned based on typical device usage patterns:
@@ -36,11 +122,28 @@ class NetworkTrafficGenerator:
         # Step 2A: Generate static MAC addresses for each device
         # These MAC addresses will remain constant for the lifetime of this generator instance
         # This ensures device identity consistency - just like real network hardware
-        router_mac = fake.mac_address()  # e.g., "aa:bb:cc:dd:ee:ff"
-        desktop_mac = fake.mac_address()  # Each device gets a unique MAC
-        iphone_mac = fake.mac_address()  # MACs are 6 pairs of hex digits
-        printer_mac = fake.mac_address()  # Separated by colons
-        android_mac = fake.mac_address()  # Generated by Faker to look realistic
+        router_mac = random_mac_address()  # e.g., "aa:bb:cc:dd:ee:ff"
+        desktop_mac = random_mac_address()  # Each device gets a unique MAC
+        iphone_mac = random_mac_address()  # MACs are 6 pairs of hex digits
+        printer_mac = random_mac_address()  # Separated by colons
+        android_mac = random_mac_address()  # Random hex digits look realistic
+
+        # Step 2A.1: One lock for the simulation
+        # The dashboard shares a single generator between every browser session,
+        # so two sessions can ask for a tick at the same time. The lock makes sure
+        # only one of them updates the devices at once.
+        self._lock = threading.Lock()
+
+        # Step 2A.2: The last tick, handed back to everyone until the next one
+        # _tick_number counts the ticks, so a caller can tell a new tick from
+        # one it already saw. _ticked_at is the time.monotonic() of the last one.
+        self._tick_number = 0
+        self._ticked_at = None
+        self._snapshot = None
+        self._alerts = []
+
+        # Every device starts with the same "last seen" time, so I format it once
+        started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # Step 2B: Define our static devices
         # We are creating a list of dictionaries, where each dictionary represents a device.
@@ -54,10 +157,8 @@ class NetworkTrafficGenerator:
                 "ip": "192.168.1.1",  # Standard gateway IP
                 "mac": router_mac,  # Use the static MAC we generated above
                 "connection_type": "Wired",  # Routers are hardwired to the modem
-                "status": "ONLINE",  # Router should always be online
-                "upload_bytes": 0,  # Cumulative upload traffic in bytes
-                "download_bytes": 0,  # Cumulative download traffic in bytes
-                "last_seen": datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Timestamp of last activity
+                "status": "ONLINE",  # Starting status - router should always be online
+                "last_seen": started  # Timestamp of last activity
             },
             {
                 # Device 2: Desktop Computer
@@ -68,9 +169,7 @@ class NetworkTrafficGenerator:
                 "mac": desktop_mac,  # Static MAC address for this device
                 "connection_type": "Wired",  # Desktops usually use Ethernet cables
                 "status": "ONLINE",
-                "upload_bytes": 0,
-                "download_bytes": 0,
-                "last_seen": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "last_seen": started
             },
             {
                 # Device 3: iPhone (Mobile Device)
@@ -81,9 +180,7 @@ class NetworkTrafficGenerator:
                 "mac": iphone_mac,  # Unique MAC for this phone
                 "connection_type": "Wi-Fi",  # Mobile devices connect wirelessly
                 "status": "ONLINE",
-                "upload_bytes": 0,
-                "download_bytes": 0,
-                "last_seen": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "last_seen": started
             },
             {
                 # Device 4: Network Printer
@@ -94,9 +191,7 @@ class NetworkTrafficGenerator:
                 "mac": printer_mac,  # Static MAC for this printer
                 "connection_type": "Wi-Fi",  # Modern printers often use wireless
                 "status": "OFFLINE",  # Starts offline (powered off/sleeping)
-                "upload_bytes": 0,
-                "download_bytes": 0,
-                "last_seen": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "last_seen": started
             },
             {
                 # Device 5: Guest Android Phone
@@ -107,67 +202,178 @@ class NetworkTrafficGenerator:
                 "mac": android_mac,  # Unique MAC for this phone
                 "connection_type": "Wi-Fi",  # Guests connect wirelessly
                 "status": "ONLINE",
-                "upload_bytes": 0,
-                "download_bytes": 0,
-                "last_seen": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                "last_seen": started
             }
         ]
 
+        # Step 2C: Per-device traffic ranges as NumPy arrays
+        # Each array has shape (2, devices): row 0 is download, row 1 is upload.
+        # With these, one rng call draws the numbers for every device at once
+        # instead of looking up the device type and calling random once per field.
+        byte_ranges = np.array(
+            [TRAFFIC_BYTE_RANGES.get(device["type"], OTHER_DEVICE_BYTE_RANGES) for device in self.devices],
+            dtype=np.int64
+        )
+        speed_ranges = np.array(
+            [TRAFFIC_SPEED_RANGES.get(device["type"], OTHER_DEVICE_SPEED_RANGES) for device in self.devices]
+        )
+        # Both are (devices, direction, low/high), so .T flips them to (direction, devices)
+        self._byte_low, self._byte_high = byte_ranges[:, :, 0].T, byte_ranges[:, :, 1].T
+        self._speed_low, self._speed_high = speed_ranges[:, :, 0].T, speed_ranges[:, :, 1].T
+
+        # True for the devices that are allowed to flip ONLINE/OFFLINE
+        self._can_toggle = np.array([device["name"] in TOGGLING_DEVICES for device in self.devices])
+
+        # Step 2D: The fields that change every tick, as NumPy arrays
+        # Same layout as the arrays tick() returns, so a tick is a few whole-array
+        # operations and a snapshot is a few array copies, not a walk over dicts.
+        # status and last_seen come out of the dicts, so self.devices only keeps
+        # the fields that never change (name, type, ip, mac, connection_type).
+        self._online = np.array([device.pop("status") == "ONLINE" for device in self.devices])
+        self._last_seen = np.array([device.pop("last_seen") for device in self.devices])
+        self._traffic_bytes = np.zeros((2, len(self.devices)), dtype=np.int64)
+        # Cumulative download (row 0) and upload (row 1) traffic in bytes
+        self._speeds = np.zeros((2, len(self.devices)), dtype=np.float32)
+        # Current download (row 0) and upload (row 1) speed in MB/s
+
+        self._names = np.array([device["name"] for device in self.devices])
+        self._names.flags.writeable = False
+        # The names never change, so every tick can hand out this same array
+
     def _simulate_traffic(self):
         """
         Internal method to simulate traffic changes and connection status.
+        Works on the whole device arrays at once (no loop over devices).
+        """
+        # One timestamp for the whole tick, instead of a strftime() per device
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        # Draw this tick's random numbers for every device at once
+        # (offline devices get numbers too - they just don't use them)
+        flips = self._can_toggle & (rng.random(len(self.devices)) < STATUS_FLIP_CHANCE)
+        added_bytes = rng.integers(self._byte_low, self._byte_high, endpoint=True)
+        speeds = rng.uniform(self._speed_low, self._speed_high)
+        # endpoint=True includes the high value, the same as random.randint()
+
+        # Randomly toggle status for Printer and Android ## used claude to help with this part, as I could not get it to work
+        # XOR with True flips ONLINE <-> OFFLINE, XOR with False leaves it alone
+        self._online ^= flips
+
+        # Only generate traffic if ONLINE
+        # Multiplying by the True/False online array zeroes out the offline devices,
+        # and the (devices,) array lines up with both rows of the (2, devices) ones
+        self._traffic_bytes += added_bytes * self._online
+        self._speeds[:] = speeds * self._online
+        # Offline devices have 0 speed
+
+        # Update timestamp while active
+        # (a device that just came online is active too, so this also resets it)
+        self._last_seen[self._online] = now
+
+    def get_device_names(self):
+        """
+        Returns the device names as a tuple, without running a traffic tick.
+        The devices never change after __init__, so the names never change either.
+        """
+        return tuple(device["name"] for device in self.devices)
+
+    def get_device_info(self):
+        """
+        Returns a copy of each device dict without running a traffic tick.
+        These only hold the fields that never change after __init__
+        (name, type, ip, mac, connection_type), so no lock is needed.
+        """
+        return [dict(device) for device in self.devices]
+
+    def tick(self):
+        """
+        Advances the simulation (at most once every TICK_SECONDS) and returns
+        everything from the latest step in one call:
+        (tick_number, devices, arrays, alerts)
+        This is the one way to read the changing device data - the other
+        get_* methods only return the fields that never change.
+
+        Every browser session shares this generator, so if the last tick is
+        less than TICK_SECONDS old I hand back that same step instead of
+        running another one. That way more viewers (or more clicks) don't make
+        the byte counters grow faster.
+
+        - tick_number: counts the steps, so a caller can skip one it already saw
+        - devices: one dict per device (the fixed fields plus status, byte
+          totals, speeds and last_seen from this step)
+        - arrays: one NumPy array per field, in the same device order:
+            - name: device names
+            - online: True/False per device (1 byte each instead of the status text)
+            - traffic_bytes: int64 cumulative totals, shape (2, devices) -
+              row 0 is download and row 1 is upload, so one sum does both
+            - speeds: float32 MB/s, shape (2, devices), same rows as above
+            - last_seen: "YYYY-MM-DD HH:MM:SS" text per device
+            - traffic_mb: traffic_bytes in MB as float32, same rows
+            - current_download_speed / current_upload_speed: the rows of speeds
+        - alerts: this step's security alerts (often [])
+
+        The arrays are shared by every caller, so they're read-only.
+        The alerts are picked from the same online devices as the snapshot,
+        all while holding the lock, so they can't disagree with each other.
+        External connections for the map aren't part of a tick - they're made
+        on their own schedule (see connection_feed.py).
         """
-        for device in self.devices:
-            # Randomly toggle status for Printer and Android ## used claude to help with this part, as I could not get it to work
-            if device["name"] in ["Home Printer", "Guest Android"]:
-                # 10% chance to flip status
-                if random.random() < 0.1:
-                    if device["status"] == "ONLINE":
-                        device["status"] = "OFFLINE"
-                    else:
-                        device["status"] = "ONLINE"
-                        # Reset timestamp when coming online
-                        device["last_seen"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-            # Only generate traffic if ONLINE
-            if device["status"] == "ONLINE":
-                if device["type"] == "Router":
-                    added_upload = random.randint(1000, 5000000)
-                    added_download = random.randint(5000, 10000000)
-                    # Router has higher throughput speeds
-                    device["current_upload_speed"] = random.uniform(0.5, 10.0)  # MB/s
-                    device["current_download_speed"] = random.uniform(2.0, 50.0)  # MB/s
-                elif device["type"] == "Printer":
-                    added_upload = random.randint(0, 1000)
-                    added_download = random.randint(0, 1000)
-                    # Printer has minimal speeds
-                    device["current_upload_speed"] = random.uniform(0.0, 0.5)  # MB/s
-                    device["current_download_speed"] = random.uniform(0.0, 0.5)  # MB/s
-                else:
-                    added_upload = random.randint(100, 1000000)
-                    added_download = random.randint(500, 5000000)
-                    # Other devices (desktops, mobile) have moderate speeds
-                    device["current_upload_speed"] = random.uniform(0.1, 5.0)  # MB/s
-                    device["current_download_speed"] = random.uniform(0.5, 25.0)  # MB/s
-
-                device["upload_bytes"] += added_upload
-                device["download_bytes"] += added_download
-
-                # Update timestamp while active
-                device["last_seen"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            else:
-                # Offline devices have 0 speed
-                device["current_upload_speed"] = 0.0
-                device["current_download_speed"] = 0.0
-
-    def get_devices(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._ticked_at is None or now - self._ticked_at >= TICK_SECONDS * 0.9:
+                # The * 0.9 is a little slack for timers that fire a few
+                # milliseconds early, so they still get a fresh tick
+                self._simulate_traffic()
+                self._snapshot = self._take_snapshot()
+                self._alerts = self.generate_security_alerts()
+                self._tick_number += 1
+                self._ticked_at = now
+            tick_number, arrays, alerts = self._tick_number, self._snapshot, self._alerts
+
+        devices = [
+            dict(
+                device,
+                status="ONLINE" if online else "OFFLINE",
+                download_bytes=download_bytes,
+                upload_bytes=upload_bytes,
+                current_download_speed=download_speed,
+                current_upload_speed=upload_speed,
+                last_seen=seen
+            )
+            for device, online, download_bytes, upload_bytes, download_speed, upload_speed, seen in zip(
+                self.devices, arrays["online"].tolist(),
+                *arrays["traffic_bytes"].tolist(), *arrays["speeds"].tolist(), arrays["last_seen"].tolist()
+            )
+        ]
+        # The dicts are built outside the lock, so other sessions don't have to
+        # wait on this part (each caller gets its own dicts to change if it wants)
+        return tick_number, devices, arrays, list(alerts)
+
+    def _take_snapshot(self):
         """
-        Public method to get the current state of devices.
-        Triggers a traffic simulation update before returning.
+        Copies the device arrays for one tick (called while holding the lock)
+        See tick() for what's in them
         """
-        # Step 4: Update traffic before returning data
-        self._simulate_traffic()
-        return self.devices
+        arrays = {
+            "name": self._names,
+            "online": self._online.copy(),
+            "traffic_bytes": self._traffic_bytes.copy(),
+            "speeds": self._speeds.copy(),
+            "last_seen": self._last_seen.copy()
+        }
+
+        arrays["traffic_mb"] = np.multiply(arrays["traffic_bytes"], MB_PER_BYTE, dtype=np.float32)
+        # Both rows go from int64 bytes to float32 MB in one vectorized multiply,
+        # so nothing downstream does the MB math per device
+
+        arrays["current_download_speed"], arrays["current_upload_speed"] = arrays["speeds"]
+        # Unpacking a 2-row array gives me its rows as views (no copies)
+
+        for values in arrays.values():
+            values.flags.writeable = False
+        # Every session gets these same arrays until the next tick,
+        # so nobody gets to change them in place
+        return arrays
 
     def generate_external_connections(self):
         """
@@ -177,37 +383,26 @@ class NetworkTrafficGenerator:
         - 10% China
         - 10% Russia
         - 30% EU
+
+        Returns a dict of float32 NumPy arrays: {"lat": [...], "lon": [...]}
+        (one array per field, so the map never has to read a list of dicts)
         """
-        connections = []
         # Generate a random number of active connections (e.g., 10-20)
-        num_connections = random.randint(10, 20)
-
-        for _ in range(num_connections):
-            r = random.random()
-
-            if r < 0.5:
-                # US (Approx Center: 37, -95)
-                lat = 37.0 + random.uniform(-10, 10)
-                lon = -95.0 + random.uniform(-20, 20)
-            elif r < 0.6:
-                # China (Approx Center: 35, 104)
-                lat = 35.0 + random.uniform(-5, 5)
-                lon = 104.0 + random.uniform(-10, 10)
-            elif r < 0.7:
-                # Russia (Approx Center: 61, 105)
-                lat = 61.0 + random.uniform(-10, 10)
-                lon = 105.0 + random.uniform(-20, 20)
-            else:
-                # EU (Approx Center: 50, 10)
-                lat = 50.0 + random.uniform(-5, 10)
-                lon = 10.0 + random.uniform(-10, 20)
-
-            connections.append({
-                "lat": lat,
-                "lon": lon
-            })
-
-        return connections
+        num_connections = rng.integers(10, 20, endpoint=True)
+
+        # Pick a region for every connection at once using the weights above
+        regions = np.searchsorted(CONNECTION_CUMULATIVE_WEIGHTS, rng.random(num_connections), side='right')
+
+        # Spread each connection somewhere inside its region's box
+        # Indexing the tables with the region numbers gives one row per connection
+        points = CONNECTION_CENTERS[regions] + rng.uniform(
+            CONNECTION_OFFSET_LOW[regions], CONNECTION_OFFSET_HIGH[regions]
+        )
+
+        return {
+            "lat": points[:, 0].astype(np.float32),
+            "lon": points[:, 1].astype(np.float32)
+        }
 
     def generate_security_alerts(self):
         """
@@ -230,7 +425,7 @@ class NetworkTrafficGenerator:
         num_alerts = random.randint(1, 2)
 
         # Get list of online devices
-        online_devices = [d for d in self.devices if d['status'] == 'ONLINE']
+        online_devices = [d for d, online in zip(self.devices, self._online) if online]
 
         if not online_devices:
             return alerts
@@ -251,13 +446,13 @@ class NetworkTrafficGenerator:
             if alert_type == 'risky_geo':
                 # Generate IP from risky countries
                 country = random.choice(['China', 'Russia', 'North Korea', 'Iran'])
-                external_ip = fake.ipv4_public()
+                external_ip = random_public_ipv4()
                 reason = f"Connection from {country}"
                 severity = "High"
 
             elif alert_type == 'port_scan':
                 # Port scanning activity
-                external_ip = fake.ipv4_public()
+                external_ip = random_public_ipv4()
                 ports = random.choice([
                     "22, 23, 80, 443, 3389",
                     "21, 22, 3306, 5432",
@@ -268,14 +463,14 @@ class NetworkTrafficGenerator:
 
             elif alert_type == 'data_exfiltration':
                 # Large data upload
-                external_ip = fake.ipv4_public()
+                external_ip = random_public_ipv4()
                 data_size = random.randint(500, 2000)
                 reason = f"Large upload detected ({data_size} MB to unknown IP)"
                 severity = "High"
 
             else:  # unusual_port
                 # Unusual port access
-                external_ip = fake.ipv4_public()
+                external_ip = random_public_ipv4()
                 port = random.choice([22, 23, 3389, 3306, 5432, 27017, 6379])
                 port_name = {
                     22: "SSH",
@@ -290,8 +485,11 @@ class NetworkTrafficGenerator:
                 severity = "Medium"
 
             # Create alert dictionary
+            # The display string is made once here instead of on every dashboard refresh
+            now = datetime.now()
             alert = {
-                'timestamp': datetime.now(),
+                'timestamp': now,
+                'time': now.strftime("%Y-%m-%d %H:%M:%S"),
                 'device': device['name'],
                 'external_ip': external_ip,
                 'reason': reason,
@@ -0,0 +1,180 @@
+# =============================================================================
+# TRAFFIC HISTORY MODULE
+# =============================================================================
+# INF601 - Advanced Programming in Python
+# Jeremy McKowski
+# Final Project
+#
+# This file stores the speed history for my 30-minute throughput graph
+# I used to keep three Python lists and rebuild them every refresh to throw
+# away old points. Now I use fixed-size NumPy arrays as a "ring buffer":
+# new points overwrite the oldest ones, so nothing ever has to be rebuilt
+
+# =============================================================================
+# IMPORT REQUIRED LIBRARIES
+# =============================================================================
+import numpy as np
+# NumPy arrays store plain numbers (8 or 4 bytes each) instead of Python objects
+# That uses way less memory and Plotly can send them to the browser faster
+
+import time
+# My timestamps come from time.monotonic_ns(), a clock that only counts forward
+
+from datetime import datetime
+# I only use datetime once, to line the monotonic clock up with my local clock
+
+# =============================================================================
+# DEFAULT SETTINGS
+# =============================================================================
+# My graph shows the last 30 minutes, in the same nanoseconds as my timestamps
+HISTORY_WINDOW_NS = 30 * 60 * 1_000_000_000
+
+# The closest two samples can be (0.9 seconds)
+# Changing the dropdown or other controls also runs my live panel, so without
+# this, clicking around could squeeze extra samples in and push the oldest part
+# of the 30 minutes out of the buffer early
+# My fastest refresh rate is 1 second, and I leave a little slack under that
+# so a timer tick that fires a hair early still gets recorded
+HISTORY_MIN_SPACING_NS = 900_000_000
+
+# With samples at least 0.9 seconds apart, 30 minutes is at most 2,000 points
+HISTORY_CAPACITY = HISTORY_WINDOW_NS // HISTORY_MIN_SPACING_NS
+
+# time.monotonic_ns() counts from some point when the computer started, not from 1970
+# Adding this offset turns one of those timestamps into my local clock time,
+# so I only need it when I draw the graph's time axis
+# Python only imports this file once, so I measure the offset once
+MONOTONIC_TO_LOCAL_NS = int(np.datetime64(datetime.now(), 'ns').astype(np.int64)) - time.monotonic_ns()
+
+# I store the speeds as whole hundredths of a MB/s (12.34 MB/s is stored as 1234)
+# That keeps my 2 decimal places but fits in a uint16 (2 bytes instead of 4)
+# The biggest value a uint16 holds is 65,535, so speeds top out at 655.35 MB/s
+# (my whole simulated network peaks around 125 MB/s, so that's plenty)
+SPEED_SCALE = 100
+SPEED_MAX_STORED = np.iinfo(np.uint16).max
+
+
+# =============================================================================
+# TrafficHistory CLASS DEFINITION
+# =============================================================================
+class TrafficHistory:
+    """
+    A ring buffer of (timestamp, download speed, upload speed) samples
+
+    - Timestamps are stored as int64 nanoseconds from time.monotonic_ns()
+    - Speeds are stored as uint16 hundredths of a MB/s (2 decimal places is all
+      my graph needs) and turned back into float32 MB/s when I read them
+    - With devices=N each sample holds a row of N speeds (one per device)
+      that all share the same timestamp
+    - head is where the next sample goes, count is how many samples I have
+    """
+
+    def __init__(self, capacity=HISTORY_CAPACITY, devices=None, min_spacing_ns=HISTORY_MIN_SPACING_NS):
+        """
+        Allocates the empty arrays once - they never grow after this
+        devices=None keeps one speed per sample (like my all-devices total)
+        min_spacing_ns is how close together two samples are allowed to be
+        """
+        speed_shape = capacity if devices is None else (capacity, devices)
+        self.capacity = capacity
+        self.min_spacing_ns = min_spacing_ns
+        self.timestamps = np.empty(capacity, dtype=np.int64)
+        self.download_speeds = np.empty(speed_shape, dtype=np.uint16)
+        self.upload_speeds = np.empty(speed_shape, dtype=np.uint16)
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, timestamp_ns, download_speed, upload_speed):
+        """
+        Writes one sample at the head and moves the head forward
+        When the buffer is full this overwrites the oldest sample
+        With devices=N the speeds are arrays of N (one write for every device)
+        A sample that comes less than min_spacing_ns after the last one is
+        skipped, so the buffer always covers the whole time window
+        Returns True if the sample was stored
+        """
+        if self.count and timestamp_ns - self.timestamps[self.head - 1] < self.min_spacing_ns:
+            return False
+        # head - 1 is the newest sample (-1 wraps to the end of the array)
+
+        self.timestamps[self.head] = timestamp_ns
+        self.download_speeds[self.head] = _quantize(download_speed)
+        self.upload_speeds[self.head] = _quantize(upload_speed)
+
+        # % wraps the head back to 0 when it hits the end of the arrays
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return True
+
+    def since(self, cutoff_ns, device=None):
+        """
+        Returns the ordered samples with a timestamp >= cutoff_ns
+        The timestamps are sorted, so searchsorted finds the cutoff without a loop
+        I cut first and convert the speeds after, so I only convert what I return
+        With devices=N, device picks which device's column of speeds I get back,
+        and device=None adds up every device's speeds into one network total
+        """
+        timestamps, downloads, uploads = self._window_raw(cutoff_ns)
+        if device is not None:
+            downloads, uploads = downloads[:, device], uploads[:, device]
+        elif downloads.ndim == 2:
+            # uint32 so adding up a few devices' uint16 speeds can't overflow
+            downloads = downloads.sum(axis=1, dtype=np.uint32)
+            uploads = uploads.sum(axis=1, dtype=np.uint32)
+        return timestamps, _dequantize(downloads), _dequantize(uploads)
+
+    def _window_raw(self, cutoff_ns):
+        """
+        Returns the stored arrays with a timestamp >= cutoff_ns, oldest to
+        newest (speeds still as uint16)
+        Before the buffer wraps this is just a slice (no copying)
+        Once the buffer has wrapped, the samples are in two sorted pieces
+        (head to the end is older, the start up to head is newer), so I find
+        the cutoff in each piece and only glue together the rows I keep,
+        instead of copying the whole buffer into order and then cutting it
+        """
+        if self.count < self.capacity:
+            start = np.searchsorted(self.timestamps[:self.count], cutoff_ns, side='left')
+            return (
+                self.timestamps[start:self.count],
+                self.download_speeds[start:self.count],
+                self.upload_speeds[start:self.count]
+            )
+
+        older = self.head + np.searchsorted(self.timestamps[self.head:], cutoff_ns, side='left')
+        newer = np.searchsorted(self.timestamps[:self.head], cutoff_ns, side='left')
+        if older == self.capacity:
+            # Everything in the older piece is too old, so the newer piece is
+            # all I need and it's already one slice (no copying)
+            return (
+                self.timestamps[newer:self.head],
+                self.download_speeds[newer:self.head],
+                self.upload_speeds[newer:self.head]
+            )
+
+        return (
+            np.concatenate((self.timestamps[older:], self.timestamps[:self.head])),
+            np.concatenate((self.download_speeds[older:], self.download_speeds[:self.head])),
+            np.concatenate((self.upload_speeds[older:], self.upload_speeds[:self.head]))
+        )
+
+
+# =============================================================================
+# SPEED CONVERSION HELPERS
+# =============================================================================
+def _quantize(speed):
+    """
+    Turns MB/s speeds into whole hundredths, clipped to fit a uint16
+    Works on one speed or a whole array of them
+    """
+    return np.clip(np.rint(np.multiply(speed, SPEED_SCALE)), 0, SPEED_MAX_STORED)
+
+
+def _dequantize(stored):
+    """Turns stored hundredths back into float32 MB/s for the graph"""
+    return stored.astype(np.float32) / np.float32(SPEED_SCALE)
+
+###///###
@@ -1,9 +1,18 @@
 import os
+import time
+import orjson
 import requests
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# How long a weather reading is reused before asking AccuWeather again
+WEATHER_CACHE_SECONDS = 600
+
+# After a failed lookup, how long to wait before trying AccuWeather again
+WEATHER_RETRY_SECONDS = 60
+
+# Where location keys are saved between runs (city and state never change,
+# so the lookup only has to happen once per city, not once per app start)
+LOCATION_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'weather_loc.json')
 
 class WeatherFetcher:
     """
@@ -12,10 +21,19 @@ class WeatherFetcher:
 
     def __init__(self):
         """Initialize with API key and location from environment variables"""
+        # Load environment variables from .env file (only when a fetcher is made,
+        # not every time this module is imported)
+        load_dotenv()
         self.api_key = os.getenv('ACCUWEATHER_API_KEY')
         self.city = os.getenv('WEATHER_CITY', 'Hays')
         self.state = os.getenv('WEATHER_STATE', 'KS')
-        self.location_key = None
+        self.location_key = _load_location_keys().get(self._location_name())
+        # One session for every AccuWeather call, so the connection gets reused
+        # instead of opening a new one for each request
+        self.session = requests.Session()
+        self._cached_weather = None
+        self._cached_at = None
+        self._failed_at = None
 
     def get_location_key(self):
         """
@@ -30,15 +48,16 @@ class WeatherFetcher:
             url = "http://dataservice.accuweather.com/locations/v1/cities/US/search"
             params = {
                 'apikey': self.api_key,
-                'q': f"{self.city}, {self.state}"
+                'q': self._location_name()
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             if data and len(data) > 0:
                 self.location_key = data[0]['Key']
+                self._save_location_key()
                 return self.location_key
             else:
                 return None
@@ -47,11 +66,40 @@ class WeatherFetcher:
             print(f"Error fetching location key: {e}")
             return None
 
+    def _location_name(self):
+        """The "City, ST" string used for the search and as the location cache key"""
+        return f"{self.city}, {self.state}"
+
+    def _save_location_key(self):
+        """Adds this city's location key to the file at LOCATION_CACHE_PATH"""
+        keys = _load_location_keys()
+        keys[self._location_name()] = self.location_key
+        try:
+            os.makedirs(os.path.dirname(LOCATION_CACHE_PATH), exist_ok=True)
+            with open(LOCATION_CACHE_PATH, 'wb') as f:
+                f.write(orjson.dumps(keys))
+        except OSError as e:
+            # Not being able to save only means looking it up again next time
+            print(f"Error saving location key: {e}")
+
     def get_current_weather(self):
         """
         Fetch current weather conditions
+        A successful reading is reused for WEATHER_CACHE_SECONDS, so calling this
+        on every dashboard refresh doesn't make an HTTP request every time
+        After a failure it waits WEATHER_RETRY_SECONDS before trying again
+        (returning the last good reading, if any, in the meantime)
         Returns: Dictionary with weather data or None if error
         """
+        now = time.monotonic()
+        if self._cached_weather is not None and now - self._cached_at < WEATHER_CACHE_SECONDS:
+            return self._cached_weather
+
+        # Don't retry a failing API (or a missing key) on every call
+        if self._failed_at is not None and now - self._failed_at < WEATHER_RETRY_SECONDS:
+            return self._cached_weather
+
+        self._failed_at = now
         location_key = self.get_location_key()
 
         if not location_key:
@@ -65,10 +113,10 @@ class WeatherFetcher:
                 'details': 'true'
             }
 
-            response = requests.get(url, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             if data and len(data) > 0:
                 conditions = data[0]
 
@@ -81,10 +129,13 @@ class WeatherFetcher:
                     'wind_speed': conditions['Wind']['Speed']['Imperial']['Value'],
                     'wind_unit': conditions['Wind']['Speed']['Imperial']['Unit'],
                     'wind_direction': conditions['Wind']['Direction']['English'],
-                    'city': f"{self.city}, {self.state}",
+                    'city': self._location_name(),
                     'icon': conditions.get('WeatherIcon', 1)
                 }
 
+                self._cached_weather = weather_data
+                self._cached_at = now
+                self._failed_at = None
                 return weather_data
             else:
                 return None
@@ -92,3 +143,17 @@ class WeatherFetcher:
         except Exception as e:
             print(f"Error fetching weather data: {e}")
             return None
+
+
+def _load_location_keys():
+    """
+    Reads the saved {"City, ST": location key} lookups from LOCATION_CACHE_PATH
+    Returns an empty dict if the file is missing or unreadable
+    """
+    try:
+        with open(LOCATION_CACHE_PATH, 'rb') as f:
+            keys = orjson.loads(f.read())
+    except (OSError, ValueError):
+        # orjson's decode error is a ValueError too
+        return {}
+    return keys if isinstance(keys, dict) else {}